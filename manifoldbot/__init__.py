@@ -9,25 +9,49 @@ __version__ = "0.2.5"
 __author__ = "Peter Cotton"
 __email__ = "peter@example.com"
 
-from .config.settings import load_config
+from importlib import import_module
 
-# Core imports - these will be available when someone does `import manifoldbot`
-from .manifold.reader import ManifoldReader
-from .manifold.writer import ManifoldWriter
-from .manifold.comments import Comment, CommentReply, CommentGenerator
-from .manifold.bot import (
-    ManifoldBot, DecisionMaker, MarketDecision, TradingSession,
-    RandomDecisionMaker, KellyCriterionDecisionMaker, ConfidenceBasedDecisionMaker, LLMDecisionMaker
-)
+# Public names and the submodule each lives in. They are imported on first
+# access (PEP 562) so that e.g. `from manifoldbot import ManifoldReader` does
+# not pay for pydantic settings or the bot framework.
+_LAZY_IMPORTS = {
+    "load_config": ".config.settings",
+    "ManifoldReader": ".manifold.reader",
+    "ManifoldWriter": ".manifold.writer",
+    "TokenBucket": ".manifold.rate_limit",
+    "Comment": ".manifold.comments",
+    "CommentReply": ".manifold.comments",
+    "CommentGenerator": ".manifold.comments",
+    "ManifoldBot": ".manifold.bot",
+    "DecisionMaker": ".manifold.bot",
+    "MarketDecision": ".manifold.bot",
+    "TradingSession": ".manifold.bot",
+    "RandomDecisionMaker": ".manifold.bot",
+    "KellyCriterionDecisionMaker": ".manifold.bot",
+    "ConfidenceBasedDecisionMaker": ".manifold.bot",
+    "LLMDecisionMaker": ".manifold.bot",
+    "analyze_market_with_gpt": ".ai.openai_client",
+}
 
-# AI integration
-from .ai.openai_client import analyze_market_with_gpt
+
+def __getattr__(name):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
 
 # Main exports
 __all__ = [
     "load_config",
     "ManifoldReader",
     "ManifoldWriter",
+    "TokenBucket",
     "Comment",
     "CommentReply", 
     "CommentGenerator",
@@ -4,8 +4,17 @@ Simple AI module for ManifoldBot.
 Just handles OpenAI API calls cleanly.
 """
 
-from .openai_client import analyze_market_with_gpt
+from .cache import LLMCache, SemanticCache
+from .openai_client import (
+    analyze_market_with_gpt, analyze_market_with_gpt_async, analyze_markets_with_batch_api,
+    analyze_markets_with_gpt
+)
 
 __all__ = [
+    "LLMCache",
+    "SemanticCache",
     "analyze_market_with_gpt",
+    "analyze_market_with_gpt_async",
+    "analyze_markets_with_batch_api",
+    "analyze_markets_with_gpt",
 ]
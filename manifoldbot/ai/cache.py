@@ -0,0 +1,243 @@
+"""
+Response cache for LLM market analyses.
+
+Identical requests (same model, messages and temperature) return the parsed
+analysis from memory, or from a SQLite file if a path is given, instead of
+paying for another completion. SemanticCache extends this to questions that
+are worded differently but mean the same thing.
+"""
+
+import hashlib
+import json
+import math
+import operator
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+DEFAULT_CACHE_PATH = "~/.manifoldbot/llm_cache.sqlite"
+
+
+class LLMCache:
+    """
+    Two-level (memory + optional SQLite) cache keyed by request hash.
+
+    Values must be JSON-serializable; entries expire after ``ttl`` seconds.
+    The memory level keeps the ``max_entries`` most recently used entries.
+    """
+
+    def __init__(self, path: Optional[str] = None, ttl: float = 86400, max_entries: int = 1000):
+        """
+        Initialize the cache.
+
+        Args:
+            path: SQLite file to persist entries across runs (memory only if None)
+            ttl: Time to live for entries in seconds
+            max_entries: Least recently used entries are dropped from memory beyond
+                this many (they stay in the SQLite file, if any)
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+
+        if path:
+            path = os.path.expanduser(path)
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache (key TEXT PRIMARY KEY, value TEXT, expires_at REAL)"
+            )
+            self._db.commit()
+
+    @staticmethod
+    def make_key(payload: Dict[str, Any]) -> str:
+        """
+        Hash a request payload into a cache key.
+
+        Args:
+            payload: JSON-serializable request (model, messages, ...)
+
+        Returns:
+            Hex SHA-256 digest of the canonical JSON encoding
+        """
+        encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False).encode("utf-8")
+        return hashlib.sha256(encoded).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached value.
+
+        Args:
+            key: Cache key from make_key
+
+        Returns:
+            Cached value, or None if missing or expired
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > now:
+                    self._memory.move_to_end(key)
+                    return value
+                del self._memory[key]
+
+            if self._db is None:
+                return None
+
+            row = self._db.execute(
+                "SELECT value, expires_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or row[1] <= now:
+                return None
+
+            value = json.loads(row[0])
+            self._remember(key, (row[1], value))
+            return value
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        """
+        Store a value.
+
+        Args:
+            key: Cache key from make_key
+            value: JSON-serializable value
+        """
+        expires_at = time.time() + self.ttl
+        with self._lock:
+            self._remember(key, (expires_at, value))
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO llm_cache (key, value, expires_at) VALUES (?, ?, ?)",
+                    (key, json.dumps(value), expires_at),
+                )
+                self._db.commit()
+
+    def _remember(self, key: str, entry: tuple) -> None:
+        """Put an entry in memory, evicting the least recently used beyond max_entries (lock held)."""
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM llm_cache")
+                self._db.commit()
+
+
+class SemanticCache:
+    """
+    In-memory cache keyed by embedding similarity.
+
+    Near-duplicate market questions ("Will X win?" / "Is X going to win?")
+    miss the exact LLMCache but land within ``threshold`` cosine similarity
+    of each other here. Lookups are a linear scan, which is fine for the few
+    hundred questions a bot sees per run. Like LLMCache, entries can be
+    persisted to a SQLite file so later runs start warm.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.95,
+        model: str = "text-embedding-3-small",
+        max_entries: int = 1000,
+        path: Optional[str] = None
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            threshold: Minimum cosine similarity for a hit
+            model: OpenAI embedding model used to embed questions
+            max_entries: Oldest entries are dropped beyond this many
+            path: SQLite file to persist entries across runs (memory only if None)
+        """
+        self.threshold = threshold
+        self.model = model
+        self.max_entries = max_entries
+        self._entries = deque(maxlen=max_entries)
+        self._lock = threading.Lock()
+        self._db = None
+
+        if path:
+            path = os.path.expanduser(path)
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS semantic_cache "
+                "(id INTEGER PRIMARY KEY AUTOINCREMENT, model TEXT, vector TEXT, value TEXT)"
+            )
+            self._db.commit()
+            # Embeddings from different models aren't comparable, so only load this model's
+            rows = self._db.execute(
+                "SELECT vector, value FROM semantic_cache WHERE model = ? ORDER BY id DESC LIMIT ?",
+                (model, max_entries),
+            ).fetchall()
+            for vector, value in reversed(rows):
+                self._entries.append((tuple(json.loads(vector)), json.loads(value)))
+
+    @staticmethod
+    def _normalize(embedding: Sequence[float]) -> Tuple[float, ...]:
+        """Scale an embedding to unit length so a dot product is its cosine."""
+        norm = math.sqrt(sum(x * x for x in embedding)) or 1.0
+        return tuple(x / norm for x in embedding)
+
+    def get(self, embedding: Sequence[float]) -> Optional[Dict[str, Any]]:
+        """
+        Find the value stored for the most similar embedding.
+
+        Args:
+            embedding: Embedding of the question being looked up
+
+        Returns:
+            Cached value, or None if nothing reaches the threshold
+        """
+        query = self._normalize(embedding)
+        best_score, best_value = self.threshold, None
+        with self._lock:
+            for vector, value in self._entries:
+                score = sum(map(operator.mul, query, vector))
+                if score >= best_score:
+                    best_score, best_value = score, value
+        return best_value
+
+    def set(self, embedding: Sequence[float], value: Dict[str, Any]) -> None:
+        """
+        Store a value under an embedding.
+
+        Args:
+            embedding: Embedding of the question
+            value: Value to return for similar questions
+        """
+        vector = self._normalize(embedding)
+        with self._lock:
+            self._entries.append((vector, value))
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT INTO semantic_cache (model, vector, value) VALUES (?, ?, ?)",
+                    (self.model, json.dumps(vector), json.dumps(value)),
+                )
+                self._db.execute(
+                    "DELETE FROM semantic_cache WHERE model = ? AND id NOT IN "
+                    "(SELECT id FROM semantic_cache WHERE model = ? ORDER BY id DESC LIMIT ?)",
+                    (self.model, self.model, self.max_entries),
+                )
+                self._db.commit()
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM semantic_cache WHERE model = ?", (self.model,))
+                self._db.commit()
@@ -3,8 +3,362 @@ Simple OpenAI call for ManifoldBot.
 
 """
 
+import json
 import os
-from typing import Dict, Any, Optional
+import re
+import time
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple
+
+from .cache import LLMCache, SemanticCache
+
+
+# Static instructions come first so repeated calls share a byte-identical
+# prompt prefix (eligible for OpenAI's server-side prompt caching); only the
+# market-specific lines at the end vary.
+SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": "You are a market analyst. Provide direct, concise answers in the requested format."
+}
+
+# Single-market prompts are pre-split into constant pieces around the market
+# fields and joined per call, rather than re-parsing a format template each time.
+_PROMPT_PREFIX = """
+Analyze this prediction market and provide your probability estimate.
+
+Provide your analysis in this exact format:
+
+PROBABILITY: [your percentage]
+CONFIDENCE: [your confidence percentage]
+REASONING: [your brief explanation]
+
+Be direct and provide the final answer immediately.
+
+Question: """
+_JSON_PROMPT_PREFIX = """
+Analyze this prediction market and provide your probability estimate.
+
+Respond with a JSON object of this exact form:
+
+{"probability": <your percentage>, "confidence": <your confidence percentage>, "reasoning": "<your brief explanation>"}
+
+Be direct and provide the final answer immediately.
+
+Question: """
+_DESCRIPTION_LABEL = "\nDescription: "
+_PROBABILITY_LABEL = "\nCurrent market probability: "
+
+_BATCH_PROMPT_TEMPLATE = """
+Analyze each of the following prediction markets and provide your probability estimate for each.
+
+Respond with a JSON object of this exact form, with one entry per market:
+
+{{"results": [{{"i": <market number>, "probability": <your percentage>, "confidence": <your confidence percentage>, "reasoning": "<your brief explanation>"}}]}}
+
+Be direct and provide the final answer immediately.
+
+{markets}
+"""
+
+_BATCH_MARKET_TEMPLATE = """{i}. Question: {question}
+Description: {description}
+Current market probability: {current_probability:.1%}
+"""
+
+# The OpenAI client retries 429s and 5xx with backoff, honouring Retry-After
+OPENAI_MAX_RETRIES = 5
+
+# Markets per batched request; larger batches risk truncated JSON
+MAX_BATCH_SIZE = 10
+
+# Terminal states of an OpenAI Batch API job
+_BATCH_DONE_STATUSES = ("completed", "failed", "expired", "cancelled")
+
+
+_PARSE_RE = re.compile(r"^\s*(PROBABILITY|CONFIDENCE|REASONING)\s*:[ \t]*(.+?)\s*$", re.M | re.I)
+_PCT_RE = re.compile(r"(\d+(?:\.\d*)?|\.\d+)")
+_FIELD_DONE_RE = {
+    field: re.compile(rf"^\s*{field}\s*:.*\n", re.M | re.I) for field in ("PROBABILITY", "CONFIDENCE", "REASONING")
+}
+
+# Lines a streamed reply must complete before reading stops
+_ALL_FIELDS = ("REASONING",)
+_ANSWER_FIELDS = ("PROBABILITY", "CONFIDENCE")
+
+
+@lru_cache(maxsize=8)
+def _get_client(api_key: Optional[str]):
+    """Return a cached OpenAI client so its connection pool is reused across calls."""
+    import openai
+    
+    return openai.OpenAI(api_key=api_key, max_retries=OPENAI_MAX_RETRIES)
+
+
+def _build_request(
+    question: str,
+    description: str,
+    current_probability: float,
+    model: str,
+    temperature: Optional[float] = None,
+    json_mode: bool = False
+) -> Dict[str, Any]:
+    """Build the chat completion parameters for a market analysis."""
+    prompt = "".join((
+        _JSON_PROMPT_PREFIX if json_mode else _PROMPT_PREFIX,
+        question,
+        _DESCRIPTION_LABEL,
+        description,
+        _PROBABILITY_LABEL,
+        f"{current_probability:.1%}\n"
+    ))
+    
+    # Prepare API call parameters
+    params = {
+        "model": model,
+        "messages": [SYSTEM_MESSAGE, {"role": "user", "content": prompt}]
+    }
+    if json_mode:
+        params["response_format"] = {"type": "json_object"}
+    
+    # Add max_tokens based on model
+    if "gpt-5" in model:
+        params["max_completion_tokens"] = 2000  # Give GPT-5 plenty of space for reasoning
+    else:
+        params["max_tokens"] = 300
+    
+    # GPT-5 doesn't support custom temperature
+    if "gpt-5" not in model:
+        params["temperature"] = 0.3 if temperature is None else temperature
+    
+    return params
+
+
+def _build_batch_request(
+    markets: List[Dict[str, Any]],
+    model: str,
+    temperature: Optional[float] = None
+) -> Dict[str, Any]:
+    """Build the chat completion parameters for a multi-market analysis."""
+    prompt = _BATCH_PROMPT_TEMPLATE.format(markets="\n".join(
+        _BATCH_MARKET_TEMPLATE.format(
+            i=i,
+            question=market["question"],
+            description=market["description"],
+            current_probability=market["current_probability"]
+        )
+        for i, market in enumerate(markets, 1)
+    ))
+    
+    params = {
+        "model": model,
+        "messages": [SYSTEM_MESSAGE, {"role": "user", "content": prompt}],
+        "response_format": {"type": "json_object"}
+    }
+    
+    if "gpt-5" in model:
+        params["max_completion_tokens"] = 2000 + 300 * len(markets)
+    else:
+        params["max_tokens"] = 300 * len(markets)
+        params["temperature"] = 0.3 if temperature is None else temperature
+    
+    return params
+
+
+def _parse_percentage(value: str) -> float:
+    """Convert a "65%" style value to a fraction, defaulting to 0.5."""
+    match = _PCT_RE.search(value)
+    try:
+        return float(match.group(1)) / 100
+    except (AttributeError, ValueError):
+        return 0.5
+
+
+def _parse_json_percentage(value: Any) -> float:
+    """
+    Convert a JSON percentage (65, "65", "65%") to a fraction.
+    
+    The prompts ask for percentages, so whole numbers (including 1 and 1.0) are
+    percentages. Only a value strictly between 0 and 1 without a "%" sign
+    (0.65, "0.65") can't be a percentage the model meant, and is taken as a fraction.
+    """
+    if isinstance(value, bool) or value is None:
+        return _parse_percentage("")
+    number = value
+    if isinstance(value, str):
+        try:
+            number = float(value.strip())
+        except ValueError:
+            return _parse_percentage(value)
+    if isinstance(number, (int, float)) and 0 < number < 1:
+        return float(number)
+    return _parse_percentage(str(value))
+
+
+def _parse_response(llm_response: str, model: str) -> Dict[str, Any]:
+    """Parse the PROBABILITY/CONFIDENCE/REASONING lines of an LLM response."""
+    # Last occurrence of each field wins
+    fields = {match.group(1).upper(): match.group(2) for match in _PARSE_RE.finditer(llm_response)}
+    
+    return {
+        "llm_probability": _parse_percentage(fields.get("PROBABILITY", "")),
+        "confidence": _parse_percentage(fields.get("CONFIDENCE", "")),
+        "reasoning": fields.get("REASONING", "No reasoning provided"),
+        "raw_response": llm_response,
+        "model_used": model,
+        "success": True
+    }
+
+
+def _check_response(llm_response: str) -> None:
+    """Reject empty or answer-less replies before parsing, so they aren't cached as 50/50 estimates."""
+    if not llm_response:
+        raise ValueError("Empty LLM response")
+    if "PROBABILITY" not in llm_response.upper():
+        raise ValueError("No PROBABILITY in LLM response")
+
+
+def _parse_json_entry(entry: Dict[str, Any], raw_response: str, model: str) -> Dict[str, Any]:
+    """Build an analysis result from one JSON estimate."""
+    return {
+        "llm_probability": _parse_json_percentage(entry.get("probability")),
+        "confidence": _parse_json_percentage(entry.get("confidence")),
+        "reasoning": str(entry.get("reasoning") or "No reasoning provided"),
+        "raw_response": raw_response,
+        "model_used": model,
+        "success": True
+    }
+
+
+def _parse_json_response(llm_response: str, model: str) -> Dict[str, Any]:
+    """Parse a JSON-mode response, falling back to the line format if it isn't valid JSON."""
+    try:
+        entry = json.loads(llm_response)
+        if not isinstance(entry, dict) or "probability" not in entry:
+            raise ValueError("No probability in JSON response")
+    except ValueError:
+        return _parse_response(llm_response, model)
+    return _parse_json_entry(entry, llm_response, model)
+
+
+def _parse_batch_response(llm_response: str, count: int, model: str) -> Dict[int, Dict[str, Any]]:
+    """
+    Parse a multi-market JSON response.
+    
+    Returns:
+        Results keyed by zero-based market index; markets the model skipped or
+        answered without a probability are absent
+    """
+    results = {}
+    for entry in json.loads(llm_response)["results"]:
+        index = int(entry["i"]) - 1
+        if entry.get("probability") in (None, ""):
+            continue  # Answer-less; retried as a single-market request rather than read as 50/50
+        if 0 <= index < count and index not in results:
+            results[index] = _parse_json_entry(entry, json.dumps(entry), model)
+    return results
+
+
+def _cached_results(
+    markets: List[Dict[str, Any]],
+    model: str,
+    temperature: Optional[float],
+    cache: Optional[LLMCache]
+) -> Tuple[List[Optional[Dict[str, Any]]], List[Optional[str]]]:
+    """Answer what we can from the cache, keyed like single-market requests."""
+    results: List[Optional[Dict[str, Any]]] = [None] * len(markets)
+    cache_keys: List[Optional[str]] = [None] * len(markets)
+    if cache is not None:
+        for i, market in enumerate(markets):
+            params = _build_request(
+                market["question"], market["description"], market["current_probability"], model, temperature
+            )
+            cache_keys[i] = LLMCache.make_key(params)
+            cached = cache.get(cache_keys[i])
+            if cached is not None:
+                results[i] = {**cached, "cached": True}
+    return results, cache_keys
+
+
+def _semantic_results(
+    markets: List[Dict[str, Any]],
+    results: List[Optional[Dict[str, Any]]],
+    client,
+    semantic_cache: Optional[SemanticCache]
+) -> Dict[int, List[float]]:
+    """
+    Fill unanswered results from the semantic cache, embedding all their questions in one call.
+    
+    Returns:
+        Embeddings of the markets that missed, by index, to store once analyzed
+    """
+    pending = [i for i, result in enumerate(results) if result is None]
+    if semantic_cache is None or not pending:
+        return {}
+    try:
+        response = client.embeddings.create(
+            model=semantic_cache.model, input=[markets[i]["question"] for i in pending]
+        )
+        # Embeddings come back in input order, but sort by index in case they don't
+        embeddings = [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+    except Exception:
+        return {}  # Semantic caching is best effort
+    
+    misses = {}
+    for i, embedding in zip(pending, embeddings):
+        similar = semantic_cache.get(embedding)
+        if similar is not None:
+            results[i] = {**similar, "cached": True}
+        else:
+            misses[i] = embedding
+    return misses
+
+
+def _stream_done(text: str, stop_after: Tuple[str, ...]) -> bool:
+    """Whether every line in stop_after has been received in full."""
+    return all(_FIELD_DONE_RE[field].search(text) for field in stop_after)
+
+
+def _read_stream(chunks, stop_after: Tuple[str, ...] = _ALL_FIELDS) -> str:
+    """Collect a streamed completion, stopping once the stop_after lines are complete."""
+    parts = []
+    try:
+        for chunk in chunks:
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if delta:
+                parts.append(delta)
+                if "\n" in delta and _stream_done("".join(parts), stop_after):
+                    break
+    finally:
+        chunks.close()
+    return "".join(parts).strip()
+
+
+async def _read_stream_async(chunks, stop_after: Tuple[str, ...] = _ALL_FIELDS) -> str:
+    """Async version of _read_stream."""
+    parts = []
+    try:
+        async for chunk in chunks:
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if delta:
+                parts.append(delta)
+                if "\n" in delta and _stream_done("".join(parts), stop_after):
+                    break
+    finally:
+        await chunks.close()
+    return "".join(parts).strip()
+
+
+def _error_result(error: Exception, model: str) -> Dict[str, Any]:
+    """Build the result returned when an analysis fails."""
+    return {
+        "llm_probability": 0.5,
+        "confidence": 0.0,
+        "reasoning": f"Error: {str(error)}",
+        "raw_response": "",
+        "model_used": model,
+        "success": False,
+        "error": str(error)
+    }
 
 
 def analyze_market_with_gpt(
@@ -12,7 +366,13 @@ def analyze_market_with_gpt(
     description: str,
     current_probability: float,
     model: str = "gpt-5",
-    api_key: Optional[str] = None
+    api_key: Optional[str] = None,
+    temperature: Optional[float] = None,
+    cache: Optional[LLMCache] = None,
+    semantic_cache: Optional[SemanticCache] = None,
+    stream: bool = False,
+    json_mode: bool = False,
+    skip_reasoning: bool = False
 ) -> Dict[str, Any]:
     """
     Analyze a market using GPT.
@@ -23,89 +383,315 @@ def analyze_market_with_gpt(
         current_probability: Current market probability
         model: GPT model to use
         api_key: OpenAI API key (defaults to env var)
+        temperature: Sampling temperature (defaults to 0.3; ignored for GPT-5)
+        cache: Optional LLMCache; identical requests are answered from it
+        semantic_cache: Optional SemanticCache; questions similar to one already
+            analyzed are answered from it (costs one embedding call per miss)
+        stream: Stream the completion and stop reading once the REASONING line
+            is complete, instead of waiting for any trailing output
+        json_mode: Ask for a JSON object (response_format=json_object) instead of
+            PROBABILITY/CONFIDENCE/REASONING lines; streaming then reads to the end
+        skip_reasoning: When streaming, stop as soon as the PROBABILITY and CONFIDENCE
+            lines are complete; the result then has no reasoning
         
     Returns:
         Dictionary with analysis results
     """
     try:
-        import openai
+        params = _build_request(question, description, current_probability, model, temperature, json_mode)
+        stop_after = _ANSWER_FIELDS if skip_reasoning and stream and not json_mode else _ALL_FIELDS
+        cache_key = None
+        if cache is not None:
+            # Keep reasoning-less results apart from full ones
+            key_params = params if stop_after is _ALL_FIELDS else {**params, "skip_reasoning": True}
+            cache_key = LLMCache.make_key(key_params)
+        if cache_key is not None:
+            cached = cache.get(cache_key)
+            if cached is not None:
+                return {**cached, "cached": True}
         
-        client = openai.OpenAI(api_key=api_key or os.getenv("OPENAI_API_KEY"))
+        client = _get_client(api_key or os.getenv("OPENAI_API_KEY"))
         
-        prompt = f"""
-Analyze this prediction market and provide your probability estimate.
-
-Question: {question}
-Description: {description}
-Current market probability: {current_probability:.1%}
-
-Provide your analysis in this exact format:
+        embedding = None
+        if semantic_cache is not None:
+            try:
+                embedding = client.embeddings.create(
+                    model=semantic_cache.model, input=question
+                ).data[0].embedding
+            except Exception:
+                pass  # Semantic caching is best effort
+            else:
+                similar = semantic_cache.get(embedding)
+                if similar is not None:
+                    return {**similar, "cached": True}
+        
+        if stream:
+            llm_response = _read_stream(client.chat.completions.create(**params, stream=True), stop_after)
+        else:
+            response = client.chat.completions.create(**params)
+            llm_response = (response.choices[0].message.content or "").strip()
+        
+        _check_response(llm_response)
+        result = _parse_json_response(llm_response, model) if json_mode else _parse_response(llm_response, model)
+        if cache_key is not None:
+            cache.set(cache_key, result)
+        if embedding is not None:
+            semantic_cache.set(embedding, result)
+        return result
+        
+    except Exception as e:
+        return _error_result(e, model)
 
-PROBABILITY: [your percentage]
-CONFIDENCE: [your confidence percentage]
-REASONING: [your brief explanation]
 
-Be direct and provide the final answer immediately.
-"""
+async def analyze_market_with_gpt_async(
+    question: str,
+    description: str,
+    current_probability: float,
+    model: str = "gpt-5",
+    api_key: Optional[str] = None,
+    client: Optional[Any] = None,
+    temperature: Optional[float] = None,
+    cache: Optional[LLMCache] = None,
+    semantic_cache: Optional[SemanticCache] = None,
+    stream: bool = False,
+    json_mode: bool = False,
+    skip_reasoning: bool = False
+) -> Dict[str, Any]:
+    """
+    Analyze a market using GPT without blocking the event loop.
+    
+    Same prompt and result format as analyze_market_with_gpt, so many markets
+    can be analyzed concurrently with asyncio.gather.
+    
+    Args:
+        question: Market question
+        description: Market description
+        current_probability: Current market probability
+        model: GPT model to use
+        api_key: OpenAI API key (defaults to env var)
+        client: Optional openai.AsyncOpenAI client to reuse across calls
+        temperature: Sampling temperature (defaults to 0.3; ignored for GPT-5)
+        cache: Optional LLMCache; identical requests are answered from it
+        semantic_cache: Optional SemanticCache; questions similar to one already
+            analyzed are answered from it (costs one embedding call per miss)
+        stream: Stream the completion and stop reading once the REASONING line
+            is complete, instead of waiting for any trailing output
+        json_mode: Ask for a JSON object (response_format=json_object) instead of
+            PROBABILITY/CONFIDENCE/REASONING lines; streaming then reads to the end
+        skip_reasoning: When streaming, stop as soon as the PROBABILITY and CONFIDENCE
+            lines are complete; the result then has no reasoning
         
-        # Prepare API call parameters
-        params = {
-            "model": model,
-            "messages": [
-                {"role": "system", "content": "You are a market analyst. Provide direct, concise answers in the requested format."},
-                {"role": "user", "content": prompt}
-            ]
-        }
+    Returns:
+        Dictionary with analysis results
+    """
+    try:
+        params = _build_request(question, description, current_probability, model, temperature, json_mode)
+        stop_after = _ANSWER_FIELDS if skip_reasoning and stream and not json_mode else _ALL_FIELDS
+        cache_key = None
+        if cache is not None:
+            # Keep reasoning-less results apart from full ones
+            key_params = params if stop_after is _ALL_FIELDS else {**params, "skip_reasoning": True}
+            cache_key = LLMCache.make_key(key_params)
+        if cache_key is not None:
+            cached = cache.get(cache_key)
+            if cached is not None:
+                return {**cached, "cached": True}
         
-        # Add max_tokens based on model
-        if "gpt-5" in model:
-            params["max_completion_tokens"] = 2000  # Give GPT-5 plenty of space for reasoning
-        else:
-            params["max_tokens"] = 300
+        if client is None:
+            import openai
+            
+            client = openai.AsyncOpenAI(
+                api_key=api_key or os.getenv("OPENAI_API_KEY"), max_retries=OPENAI_MAX_RETRIES
+            )
         
-        # GPT-5 doesn't support custom temperature
-        if "gpt-5" not in model:
-            params["temperature"] = 0.3
+        embedding = None
+        if semantic_cache is not None:
+            try:
+                embedding = (await client.embeddings.create(
+                    model=semantic_cache.model, input=question
+                )).data[0].embedding
+            except Exception:
+                pass  # Semantic caching is best effort
+            else:
+                similar = semantic_cache.get(embedding)
+                if similar is not None:
+                    return {**similar, "cached": True}
         
-        response = client.chat.completions.create(**params)
-        llm_response = response.choices[0].message.content.strip()
+        if stream:
+            llm_response = await _read_stream_async(
+                await client.chat.completions.create(**params, stream=True), stop_after
+            )
+        else:
+            response = await client.chat.completions.create(**params)
+            llm_response = (response.choices[0].message.content or "").strip()
         
-        # Parse the response
-        lines = llm_response.split('\n')
-        llm_prob = 0.5
-        confidence = 0.5
-        reasoning = "No reasoning provided"
+        _check_response(llm_response)
+        result = _parse_json_response(llm_response, model) if json_mode else _parse_response(llm_response, model)
+        if cache_key is not None:
+            cache.set(cache_key, result)
+        if embedding is not None:
+            semantic_cache.set(embedding, result)
+        return result
         
-        for line in lines:
-            if line.startswith("PROBABILITY:"):
-                try:
-                    llm_prob = float(line.split(":")[1].strip().replace("%", "")) / 100
-                except:
-                    llm_prob = 0.5
-            elif line.startswith("CONFIDENCE:"):
-                try:
-                    confidence = float(line.split(":")[1].strip().replace("%", "")) / 100
-                except:
-                    confidence = 0.5
-            elif line.startswith("REASONING:"):
-                reasoning = line.split(":", 1)[1].strip()
+    except Exception as e:
+        return _error_result(e, model)
+
+
+def analyze_markets_with_gpt(
+    markets: List[Dict[str, Any]],
+    model: str = "gpt-5",
+    api_key: Optional[str] = None,
+    temperature: Optional[float] = None,
+    cache: Optional[LLMCache] = None,
+    batch_size: int = MAX_BATCH_SIZE,
+    semantic_cache: Optional[SemanticCache] = None
+) -> List[Dict[str, Any]]:
+    """
+    Analyze several markets with one GPT request per batch.
+    
+    Markets are packed into a single prompt asking for a JSON list of
+    estimates. Any market the batch doesn't answer (unparseable reply,
+    missing entry, failed request) falls back to analyze_market_with_gpt.
+    
+    Args:
+        markets: Dicts with question, description and current_probability
+        model: GPT model to use
+        api_key: OpenAI API key (defaults to env var)
+        temperature: Sampling temperature (defaults to 0.3; ignored for GPT-5)
+        cache: Optional LLMCache, shared with analyze_market_with_gpt
+        batch_size: Maximum markets per request
+        semantic_cache: Optional SemanticCache; questions missing from cache are
+            embedded in one request and similar ones answered from it
         
-        return {
-            "llm_probability": llm_prob,
-            "confidence": confidence,
-            "reasoning": reasoning,
-            "raw_response": llm_response,
-            "model_used": model,
-            "success": True
-        }
+    Returns:
+        List of analysis results, in the same order as markets
+    """
+    results, cache_keys = _cached_results(markets, model, temperature, cache)
+    embeddings: Dict[int, List[float]] = {}
+    if semantic_cache is not None and None in results:
+        client = _get_client(api_key or os.getenv("OPENAI_API_KEY"))
+        embeddings = _semantic_results(markets, results, client, semantic_cache)
+    
+    pending = [i for i, result in enumerate(results) if result is None]
+    if len(pending) > 1:
+        client = _get_client(api_key or os.getenv("OPENAI_API_KEY"))
+        for start in range(0, len(pending), max(1, batch_size)):
+            chunk = pending[start:start + max(1, batch_size)]
+            try:
+                params = _build_batch_request([markets[i] for i in chunk], model, temperature)
+                response = client.chat.completions.create(**params)
+                parsed = _parse_batch_response(response.choices[0].message.content, len(chunk), model)
+            except Exception:
+                continue  # Fall back to single-market requests below
+            
+            for offset, result in parsed.items():
+                index = chunk[offset]
+                results[index] = result
+                if cache_keys[index] is not None:
+                    cache.set(cache_keys[index], result)
+    
+    for i, result in enumerate(results):
+        if result is None:
+            market = markets[i]
+            results[i] = analyze_market_with_gpt(
+                market["question"], market["description"], market["current_probability"],
+                model=model, api_key=api_key, temperature=temperature, cache=cache
+            )
+    
+    for i, embedding in embeddings.items():
+        if results[i].get("success", True):
+            semantic_cache.set(embedding, results[i])
+    
+    return results
+
+
+def analyze_markets_with_batch_api(
+    markets: List[Dict[str, Any]],
+    model: str = "gpt-5",
+    api_key: Optional[str] = None,
+    temperature: Optional[float] = None,
+    cache: Optional[LLMCache] = None,
+    poll_interval: float = 30.0,
+    timeout: float = 86400.0
+) -> List[Dict[str, Any]]:
+    """
+    Analyze markets through OpenAI's Batch API.
+    
+    Every uncached market becomes one line of a JSONL batch job, which is
+    billed at half the synchronous price and isn't subject to live rate
+    limits, but may take up to 24 hours. Use for large offline scans; the
+    call blocks, polling every ``poll_interval`` seconds, until the job ends.
+    Markets the job doesn't answer get an error result rather than falling
+    back to (full-price) synchronous requests.
+    
+    Args:
+        markets: Dicts with question, description and current_probability
+        model: GPT model to use
+        api_key: OpenAI API key (defaults to env var)
+        temperature: Sampling temperature (defaults to 0.3; ignored for GPT-5)
+        cache: Optional LLMCache, shared with analyze_market_with_gpt
+        poll_interval: Seconds between job status checks
+        timeout: Give up waiting (and cancel the job) after this many seconds
         
-    except Exception as e:
-        return {
-            "llm_probability": 0.5,
-            "confidence": 0.0,
-            "reasoning": f"Error: {str(e)}",
-            "raw_response": "",
-            "model_used": model,
-            "success": False,
-            "error": str(e)
-        }
+    Returns:
+        List of analysis results, in the same order as markets
+    """
+    results, cache_keys = _cached_results(markets, model, temperature, cache)
+    pending = [i for i, result in enumerate(results) if result is None]
+    
+    if pending:
+        try:
+            client = _get_client(api_key or os.getenv("OPENAI_API_KEY"))
+            lines = [
+                json.dumps({
+                    "custom_id": str(i),
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": _build_request(
+                        markets[i]["question"], markets[i]["description"],
+                        markets[i]["current_probability"], model, temperature
+                    )
+                })
+                for i in pending
+            ]
+            batch_file = client.files.create(
+                file=("markets.jsonl", "\n".join(lines).encode("utf-8")), purpose="batch"
+            )
+            batch = client.batches.create(
+                input_file_id=batch_file.id, endpoint="/v1/chat/completions", completion_window="24h"
+            )
+            
+            deadline = time.monotonic() + timeout
+            while batch.status not in _BATCH_DONE_STATUSES:
+                if time.monotonic() >= deadline:
+                    client.batches.cancel(batch.id)
+                    raise TimeoutError(f"Batch {batch.id} did not finish within {timeout:.0f}s")
+                time.sleep(poll_interval)
+                batch = client.batches.retrieve(batch.id)
+            
+            if batch.status != "completed" or not batch.output_file_id:
+                raise RuntimeError(f"Batch {batch.id} ended with status {batch.status}")
+            
+            for line in client.files.content(batch.output_file_id).text.splitlines():
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                index = int(entry["custom_id"])
+                try:
+                    llm_response = (entry["response"]["body"]["choices"][0]["message"]["content"] or "").strip()
+                    _check_response(llm_response)
+                except Exception as e:
+                    results[index] = _error_result(e, model)
+                    continue
+                results[index] = _parse_response(llm_response, model)
+                if cache_keys[index] is not None:
+                    cache.set(cache_keys[index], results[index])
+        except Exception as e:
+            for i in pending:
+                if results[i] is None:
+                    results[i] = _error_result(e, model)
+    
+    return [
+        result if result is not None else _error_result(ValueError("No response in batch output"), model)
+        for result in results
+    ]
@@ -5,7 +5,51 @@ This shows various approaches to determining bet sizes.
 """
 
 import os
-from manifoldbot import ManifoldBot, SimpleRuleDecisionMaker, KellyCriterionDecisionMaker, ConfidenceBasedDecisionMaker
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, Tuple
+
+from manifoldbot import (
+    ManifoldBot, MarketDecision, KellyCriterionDecisionMaker, ConfidenceBasedDecisionMaker
+)
+
+
+def simple_rule(market: Dict[str, Any]) -> MarketDecision:
+    """Bet a fixed amount against extreme probabilities."""
+    prob = market.get("probability", 0.5)
+    if prob < 0.1:
+        decision = "YES"
+    elif prob > 0.9:
+        decision = "NO"
+    else:
+        decision = "SKIP"
+
+    return MarketDecision(
+        market_id=market["id"],
+        question=market["question"],
+        current_probability=prob,
+        decision=decision,
+        confidence=0.5,
+        reasoning="Fade extreme probabilities",
+        outcome_type=market.get("outcomeType", "UNKNOWN"),
+        bet_amount=10 if decision != "SKIP" else None
+    )
+
+
+def run_example_1(api_key: str) -> Tuple[str, ManifoldBot]:
+    """Example 1: Simple rule-based betting."""
+    return "1. Simple Rule-Based Betting", ManifoldBot(manifold_api_key=api_key, decision_maker=simple_rule)
+
+
+def run_example_2(api_key: str) -> Tuple[str, ManifoldBot]:
+    """Example 2: Kelly Criterion betting."""
+    kelly_dm = KellyCriterionDecisionMaker(kelly_fraction=0.25, max_prob_impact=0.05)
+    return "2. Kelly Criterion Betting", ManifoldBot(manifold_api_key=api_key, decision_maker=kelly_dm)
+
+
+def run_example_3(api_key: str) -> Tuple[str, ManifoldBot]:
+    """Example 3: Confidence-based betting."""
+    confidence_dm = ConfidenceBasedDecisionMaker(base_bet=10.0, max_bet=50.0)
+    return "3. Confidence-Based Betting", ManifoldBot(manifold_api_key=api_key, decision_maker=confidence_dm)
 
 
 def main():
@@ -14,22 +58,16 @@ def main():
     if not api_key:
         print("Error: MANIFOLD_API_KEY not set")
         return
-    
-    # Example 1: Simple rule-based betting
-    print("1. Simple Rule-Based Betting:")
-    simple_dm = SimpleRuleDecisionMaker(fixed_bet=10)
-    bot1 = ManifoldBot(manifold_api_key=api_key, decision_maker=simple_dm)
-    
-    # Example 2: Kelly Criterion betting
-    print("2. Kelly Criterion Betting:")
-    kelly_dm = KellyCriterionDecisionMaker(kelly_fraction=0.25, max_prob_impact=0.05)
-    bot2 = ManifoldBot(manifold_api_key=api_key, decision_maker=kelly_dm)
-    
-    # Example 3: Confidence-based betting
-    print("3. Confidence-Based Betting:")
-    confidence_dm = ConfidenceBasedDecisionMaker(min_confidence=0.7)
-    bot3 = ManifoldBot(manifold_api_key=api_key, decision_maker=confidence_dm)
-    
+
+    # Each bot authenticates and fetches its balance on creation, so set them up concurrently
+    examples = (run_example_1, run_example_2, run_example_3)
+    with ThreadPoolExecutor(max_workers=len(examples)) as executor:
+        futures = [executor.submit(example, api_key) for example in examples]
+        results = sorted(future.result() for future in as_completed(futures))
+
+    for label, bot in results:
+        print(f"{label}: {type(bot.decision_maker).__name__}")
+
     print("All decision makers created successfully!")
 
 
@@ -7,7 +7,7 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from manifoldbot.manifold.lmsr import LMSRCalculator
+from manifoldbot.manifold.lmsr import get_calculator, kelly_bet_with_impact
 
 
 def compare_kelly_calculations():
@@ -20,25 +20,31 @@ def compare_kelly_calculations():
     bankroll = 1000.0   # Our bankroll
     kelly_fraction = 0.25  # 25% of Kelly
     
-    calculator = LMSRCalculator(liquidity)
+    calculator = get_calculator(liquidity)
+    sign = 1.0 if true_prob >= current_prob else -1.0  # +1 bets YES, -1 bets NO
     
-    print("=== Kelly Criterion: Marginal vs Average Probability ===\n")
-    print(f"Market Probability: {current_prob:.1%}")
-    print(f"Our True Probability: {true_prob:.1%}")
-    print(f"Market Liquidity: {liquidity:.0f} M$")
-    print(f"Our Bankroll: {bankroll:.0f} M$")
-    print(f"Kelly Fraction: {kelly_fraction:.1%}\n")
+    # Collect the report and write it once at the end
+    lines = []
+    out = lines.append
+    
+    out("=== Kelly Criterion: Marginal vs Average Probability ===\n")
+    out(f"Market Probability: {current_prob:.1%}")
+    out(f"Our True Probability: {true_prob:.1%}")
+    out(f"Market Liquidity: {liquidity:.0f} M$")
+    out(f"Our Bankroll: {bankroll:.0f} M$")
+    out(f"Kelly Fraction: {kelly_fraction:.1%}\n")
     
     # Test different bet sizes
     bet_sizes = [5.0, 10.0, 20.0, 50.0]
     
-    print("Bet Size | Marginal Prob | Average Prob | Kelly (Marginal) | Kelly (Average)")
-    print("-" * 80)
+    out("Bet Size | Marginal Prob | Average Prob | Kelly (Marginal) | Kelly (Average)")
+    out("-" * 80)
+    
+    # Marginal probability is the price after the bet; average is the midpoint
+    marginal_probs = calculator.calculate_new_probabilities(bet_sizes, current_prob, "YES")
     
-    for bet_size in bet_sizes:
-        # Calculate probabilities
-        marginal_prob = calculator.calculate_marginal_probability(bet_size, current_prob, "YES")
-        average_prob = calculator.calculate_effective_probability(bet_size, current_prob, "YES")
+    for bet_size, marginal_prob in zip(bet_sizes, marginal_probs):
+        average_prob = (current_prob + marginal_prob) / 2
         
         # Calculate Kelly fractions
         # Kelly = (bp - q) / b, where b = (1/p - 1)
@@ -52,66 +58,51 @@ def compare_kelly_calculations():
         marginal_bet = marginal_kelly * kelly_fraction * bankroll
         average_bet = average_kelly * kelly_fraction * bankroll
         
-        print(f"{bet_size:8.1f} | {marginal_prob:12.1%} | {average_prob:11.1%} | {marginal_bet:15.1f} | {average_bet:13.1f}")
+        out(f"{bet_size:8.1f} | {marginal_prob:12.1%} | {average_prob:11.1%} | {marginal_bet:15.1f} | {average_bet:13.1f}")
     
-    print("\n=== Key Insights ===")
-    print("1. Marginal probability is higher than average (we pay more at the end)")
-    print("2. Kelly with marginal probability is more conservative (smaller bets)")
-    print("3. Kelly with average probability overestimates our edge")
-    print("4. Using marginal probability is mathematically correct for Kelly Criterion")
+    out("\n=== Key Insights ===")
+    out("1. Marginal probability is higher than average (we pay more at the end)")
+    out("2. Kelly with marginal probability is more conservative (smaller bets)")
+    out("3. Kelly with average probability overestimates our edge")
+    out("4. Using marginal probability is mathematically correct for Kelly Criterion")
     
     # Show the optimal bet size using marginal probability
-    print(f"\n=== Optimal Bet Size Calculation ===")
+    out(f"\n=== Optimal Bet Size Calculation ===")
     
     # Find the bet size where Kelly Criterion is satisfied with marginal probability
     optimal_bet = find_optimal_kelly_bet(calculator, true_prob, current_prob, bankroll, kelly_fraction)
     
     if optimal_bet > 0:
-        marginal_prob_optimal = calculator.calculate_marginal_probability(optimal_bet, current_prob, "YES")
-        impact = calculator.calculate_market_impact(optimal_bet, current_prob, "YES")
+        outcome = "YES" if sign > 0 else "NO"
+        marginal_prob_optimal, impact = calculator.calculate_marginal_and_impact(optimal_bet, current_prob, outcome)
         
-        print(f"Optimal Bet Size: {optimal_bet:.2f} M$")
-        print(f"Marginal Probability: {marginal_prob_optimal:.1%}")
-        print(f"Market Impact: {impact:.1%}")
+        out(f"Optimal Bet Size: {optimal_bet:.2f} M$")
+        out(f"Marginal Probability: {marginal_prob_optimal:.1%}")
+        out(f"Market Impact: {impact:.1%}")
         
         # Verify Kelly Criterion
         b = (1 / marginal_prob_optimal) - 1
         kelly = (b * true_prob - (1 - true_prob)) / b
-        print(f"Kelly Fraction: {kelly:.1%}")
-        print(f"Desired Bet: {kelly * kelly_fraction * bankroll:.2f} M$")
+        out(f"Kelly Fraction: {kelly:.1%}")
+        out(f"Desired Bet: {kelly * kelly_fraction * bankroll:.2f} M$")
     else:
-        print("No positive edge found with marginal probability")
+        out("No positive edge found with marginal probability")
+    
+    print("\n".join(lines))
 
 
-def find_optimal_kelly_bet(calculator, true_prob, current_prob, bankroll, kelly_fraction, max_iterations=50):
-    """Find the bet size where Kelly Criterion is satisfied with marginal probability."""
-    
-    low, high = 0.0, bankroll
-    
-    for _ in range(max_iterations):
-        mid = (low + high) / 2
-        
-        # Calculate marginal probability for this bet size
-        marginal_prob = calculator.calculate_marginal_probability(mid, current_prob, "YES")
-        
-        # Calculate Kelly fraction with marginal probability
-        b = (1 / marginal_prob) - 1
-        kelly_fraction_calc = (b * true_prob - (1 - true_prob)) / b
-        
-        # Calculate desired bet size based on Kelly
-        desired_bet = kelly_fraction_calc * kelly_fraction * bankroll
-        
-        if kelly_fraction_calc <= 0:
-            # No positive edge
-            high = mid
-        elif abs(mid - desired_bet) < 0.01:  # Close enough
-            return mid
-        elif mid < desired_bet:
-            low = mid
-        else:
-            high = mid
+def find_optimal_kelly_bet(calculator, true_prob, current_prob, bankroll, kelly_fraction):
+    """
+    Find the bet size where Kelly Criterion is satisfied with marginal probability.
     
-    return mid
+    Uses the library solver, which takes Newton steps on g(s) = s - desired_bet(s)
+    and converges in a handful of iterations where plain bisection needs ~20.
+    No impact limit is applied here.
+    """
+    return kelly_bet_with_impact(
+        true_prob, current_prob, bankroll, calculator.b, kelly_fraction,
+        max_prob_impact=1.0, min_bet=0.0, max_bet=bankroll
+    )
 
 
 if __name__ == "__main__":
@@ -6,10 +6,9 @@ and bets YES on them.
 """
 
 import os
-import time
 from typing import Any, Dict, List
 
-from manifoldbot.manifold import ManifoldReader, ManifoldWriter
+from manifoldbot.manifold import ManifoldReader, ManifoldWriter, TokenBucket
 
 
 class AiOptimistTradingBot:
@@ -21,6 +20,8 @@ class AiOptimistTradingBot:
         self.writer = ManifoldWriter(api_key=api_key)
         self.max_bet_size = 5  # Maximum bet size in M$
         self.min_balance = 20  # Minimum balance to keep
+        self._cached_balance = None  # Tracked locally during a trading cycle
+        self.bet_limiter = TokenBucket(rate=0.5, capacity=1)  # At most one bet every 2 seconds
 
     def find_undervalued_markets(
         self, keywords: List[str], max_probability: float = 0.3
@@ -50,8 +51,9 @@ class AiOptimistTradingBot:
 
     def should_place_bet(self, market: Dict[str, Any]) -> bool:
         """Determine if we should bet on this market."""
-        # Check balance
-        if self.writer.get_balance() < self.min_balance:
+        # Check balance (tracked locally within a cycle instead of re-fetched per market)
+        balance = self._cached_balance if self._cached_balance is not None else self.writer.get_balance()
+        if balance < self.min_balance:
             return False
 
         # Check market conditions
@@ -68,6 +70,8 @@ class AiOptimistTradingBot:
         undervalued = self.find_undervalued_markets(keywords)
         print(f"Found {len(undervalued)} potentially undervalued markets")
 
+        self._cached_balance = self.writer.get_balance()
+
         for market in undervalued[:3]:  # Limit to top 3
             if self.should_place_bet(market):
                 try:
@@ -78,18 +82,19 @@ class AiOptimistTradingBot:
                     print(f"🎯 Considering: {question[:50]}...")
                     print(f"   Current probability: {probability:.1%}")
 
-                    # Place a small bet
+                    # Place a small bet, waiting only if the last one was under 2 seconds ago
+                    self.bet_limiter.acquire()
                     result = self.writer.place_bet(market_id, "YES", 2)
+                    self._cached_balance -= 2
                     print(f"   ✅ Bet placed: {result.get('betId', 'unknown')}")
 
-                    # Wait between bets to avoid rate limits
-                    time.sleep(2)
-
                 except Exception as e:
                     print(f"   ❌ Bet failed: {e}")
             else:
                 print("⏭️  Skipping market (insufficient balance or conditions)")
 
+        self._cached_balance = None
+
 
 def main():
     """Run the AI optimist trading bot."""
@@ -6,7 +6,7 @@ the ManifoldBot framework. Use --all flag to trade all markets.
 """
 
 import os
-from manifoldbot import ManifoldBot, LLMDecisionMaker, ManifoldReader
+from manifoldbot import ManifoldBot, LLMDecisionMaker
 
 
 def main(trade_all=False):
@@ -23,11 +23,12 @@ def main(trade_all=False):
         print("Error: OPENAI_API_KEY environment variable not set")
         return
     
-    # Create decision maker
+    # Create decision maker (up to 5 markets share each OpenAI request)
     decision_maker = LLMDecisionMaker(
         openai_api_key=openai_api_key,
         min_confidence=0.6,
-        model="gpt-4"
+        model="gpt-4",
+        batch_size=5
     )
     
     # Create bot
@@ -10,7 +10,7 @@ This example demonstrates:
 
 import os
 import logging
-from manifoldbot import ManifoldWriter, Comment, CommentGenerator, analyze_market_with_gpt
+from manifoldbot import ManifoldWriter, Comment, CommentGenerator
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
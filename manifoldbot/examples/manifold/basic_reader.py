@@ -14,12 +14,14 @@ def main():
     # Get recent markets
     markets = reader.get_markets(limit=5)
     
-    print("Recent Markets:")
+    # Build the listing once and write it in a single call
+    lines = ["Recent Markets:"]
     for market in markets:
-        print(f"- {market['question']}")
-        print(f"  Probability: {market['probability']:.1%}")
-        print(f"  Liquidity: {market.get('totalLiquidity', 0):.1f} M$")
-        print()
+        lines.append(f"- {market['question']}")
+        lines.append(f"  Probability: {market['probability']:.1%}")
+        lines.append(f"  Liquidity: {market.get('totalLiquidity', 0):.1f} M$")
+        lines.append("")
+    print("\n".join(lines))
 
 
 if __name__ == "__main__":
@@ -12,12 +12,15 @@ def main():
     # Create writer (requires API key)
     writer = ManifoldWriter(api_key=os.getenv("MANIFOLD_API_KEY"))
     
-    if not writer.is_authenticated():
+    # One /me call both checks the key and returns the balance
+    try:
+        me = writer.get_me()
+    except Exception:
         print("Error: Invalid API key")
         return
     
     # Get balance
-    balance = writer.get_balance()
+    balance = me.get("balance", 0.0)
     print(f"Current balance: {balance:.2f} M$")
     
     # Example: Place a bet (uncomment to actually place)
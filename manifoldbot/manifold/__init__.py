@@ -1,6 +1,7 @@
 """Manifold Markets integration."""
 
+from .rate_limit import TokenBucket
 from .reader import ManifoldReader
 from .writer import ManifoldWriter
 
-__all__ = ["ManifoldReader", "ManifoldWriter"]
+__all__ = ["ManifoldReader", "ManifoldWriter", "TokenBucket"]
@@ -4,15 +4,20 @@ Generic Manifold Markets Trading Bot Framework.
 
 """
 
+import asyncio
 import logging
 import time
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional, Callable, Union
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Callable, Sequence, Tuple, Union
 from dataclasses import dataclass
 
-from .reader import ManifoldReader
+from .reader import ManifoldReader, create_session
 from .writer import ManifoldWriter
-from .lmsr import LMSRCalculator
+from .rate_limit import TokenBucket
+from .lmsr import get_calculator, kelly_bet_with_impact
+from .cpmm import calculate_cpmm_impact, calculate_cpmm_kelly_bet
+from ..ai.cache import LLMCache, SemanticCache
 
 
 def is_metals_commodities_market(market: Dict[str, Any]) -> bool:
@@ -138,6 +143,21 @@ class DecisionMaker(ABC):
             MarketDecision object
         """
         pass
+    
+    def analyze_markets(self, markets: List[Dict[str, Any]]) -> List[MarketDecision]:
+        """
+        Analyze several markets, returning one decision per market in order.
+        
+        The default analyzes markets one at a time; I/O-bound decision makers
+        override this to analyze them concurrently.
+        
+        Args:
+            markets: Market data from Manifold API
+            
+        Returns:
+            List of MarketDecision objects
+        """
+        return [self.analyze_market(market) for market in markets]
 
 
 class ManifoldBot:
@@ -153,7 +173,9 @@ class ManifoldBot:
         manifold_api_key: str,
         decision_maker: Union[DecisionMaker, Callable[[Dict[str, Any]], MarketDecision]],
         timeout: int = 30,
-        retry_config: Optional[Dict[str, Any]] = None
+        retry_config: Optional[Dict[str, Any]] = None,
+        min_volume: float = 0.0,
+        bet_rate_limit: Optional[TokenBucket] = None
     ):
         """
         Initialize the trading bot.
@@ -163,9 +185,24 @@ class ManifoldBot:
             decision_maker: Decision maker instance or callback function
             timeout: Request timeout in seconds
             retry_config: Custom retry configuration
+            min_volume: Markets with less trading volume are skipped before analysis
+            bet_rate_limit: TokenBucket that bets wait on, e.g. one shared by several
+                bots. If omitted, each session spaces bets by its delay_between_bets.
         """
-        self.reader = ManifoldReader(timeout=timeout, retry_config=retry_config)
         self.writer = ManifoldWriter(api_key=manifold_api_key, timeout=timeout, retry_config=retry_config)
+        # The reader gets its own session (no Authorization header) on the writer's
+        # connection pool, so both reuse the same keep-alive connections
+        self.reader = ManifoldReader(
+            timeout=timeout,
+            retry_config=retry_config,
+            session=create_session(adapter=self.writer.session.get_adapter(ManifoldReader.BASE_URL))
+        )
+        
+        # Balance tracked locally while a session runs, so each bet doesn't re-fetch it
+        self._balance: Optional[float] = None
+        self.min_volume = min_volume
+        self.bet_rate_limit = bet_rate_limit
+        self._bet_limiter: Optional[TokenBucket] = None
         
         # Set up decision maker
         if callable(decision_maker):
@@ -202,7 +239,7 @@ class ManifoldBot:
         return self.decision_maker.analyze_market(market)
     
     def place_bet_if_decision(self, decision: MarketDecision, default_bet_amount: float = 10, 
-                             filter_metals_only: bool = True) -> bool:
+                             filter_metals_only: bool = True, market: Optional[Dict[str, Any]] = None) -> bool:
         """
         Place a bet if the decision is to bet.
         
@@ -210,6 +247,7 @@ class ManifoldBot:
             decision: MarketDecision object
             default_bet_amount: Default amount to bet if decision doesn't specify
             filter_metals_only: If True, only trade on metals/commodities related markets
+            market: Market data the decision was made from; fetched again only if omitted
             
         Returns:
             True if bet was placed, False otherwise
@@ -219,57 +257,70 @@ class ManifoldBot:
         
         # Check if this is a binary market - only bet on binary markets
         if not hasattr(decision, 'outcome_type') or decision.outcome_type != 'BINARY':
-            self.logger.info(f"Skipping non-binary market: {decision.question[:50]}... (type: {getattr(decision, 'outcome_type', 'unknown')})")
+            self.logger.info(
+                "Skipping non-binary market: %.50s... (type: %s)",
+                decision.question, getattr(decision, 'outcome_type', 'unknown')
+            )
             return False
         
         # Get the market data to check if it's tradeable
-        try:
-            market = self.reader.get_market(decision.market_id)
-        except Exception as e:
-            self.logger.warning(f"Could not fetch market data for {decision.market_id}: {e}")
-            return False
+        if market is None:
+            try:
+                market = self.reader.get_market(decision.market_id)
+            except Exception as e:
+                self.logger.warning("Could not fetch market data for %s: %s", decision.market_id, e)
+                return False
         
         # Check if market is tradeable (not closed, resolved, etc.)
         if not is_market_tradeable(market):
-            self.logger.info(f"Skipping closed/resolved market: {decision.question[:50]}...")
+            self.logger.info("Skipping closed/resolved market: %.50s...", decision.question)
             return False
         
         # Check if market is related to metals/commodities (if filtering enabled)
         # Always include MikhailTal's markets regardless of filter
         creator = market.get('creatorUsername') or market.get('creator', '')
         if filter_metals_only and not is_metals_commodities_market(market) and creator != 'MikhailTal':
-            self.logger.info(f"Skipping non-metals/commodities market: {decision.question[:50]}...")
+            self.logger.info("Skipping non-metals/commodities market: %.50s...", decision.question)
             return False
         
         # Use decision's bet_amount if specified, otherwise use default
         bet_amount = decision.bet_amount if decision.bet_amount is not None else default_bet_amount
         
-        # Ensure we have enough balance
-        current_balance = self.writer.get_balance()
+        # Ensure we have enough balance (tracked locally during a session)
+        current_balance = self._balance if self._balance is not None else self.writer.get_balance()
         if bet_amount > current_balance:
-            self.logger.warning(f"Insufficient balance: {current_balance:.2f} M$ < {bet_amount:.2f} M$")
+            self.logger.warning("Insufficient balance: %.2f M$ < %.2f M$", current_balance, bet_amount)
             return False
         
         try:
             # Debug: Log the bet parameters
-            self.logger.debug(f"Placing bet: market_id={decision.market_id}, outcome={decision.decision}, amount={int(bet_amount)}")
+            self.logger.debug(
+                "Placing bet: market_id=%s, outcome=%s, amount=%d", decision.market_id, decision.decision, bet_amount
+            )
+            
+            # Wait only as long as the bet rate limit requires
+            if self._bet_limiter is not None:
+                self._bet_limiter.acquire()
             
             result = self.writer.place_bet(
                 market_id=decision.market_id,
                 outcome=decision.decision,
                 amount=int(bet_amount)  # Convert to integer as required by API
             )
+            if self._balance is not None:
+                self._balance -= int(bet_amount)
             
             self.logger.info(
-                f"Placed {decision.decision} bet of {bet_amount:.2f} M$ on: {decision.question[:50]}... "
-                f"(Current: {decision.current_probability:.1%}, Conf: {decision.confidence:.1%})"
+                "Placed %s bet of %.2f M$ on: %.50s... (Current: %.1f%%, Conf: %.1f%%)",
+                decision.decision, bet_amount, decision.question,
+                decision.current_probability * 100, decision.confidence * 100
             )
             if decision.reasoning:
-                self.logger.info(f"  Rationale: {decision.reasoning}")
+                self.logger.info("  Rationale: %s", decision.reasoning)
             return True
             
         except Exception as e:
-            self.logger.error(f"Failed to place bet on {decision.market_id}: {e}")
+            self.logger.error("Failed to place bet on %s: %s", decision.market_id, e)
             return False
     
     def run_on_monitored_users(
@@ -296,7 +347,6 @@ class ManifoldBot:
         Returns:
             TradingSession with results
         """
-        initial_balance = self.writer.get_balance()
         decisions = []
         errors = []
         bets_placed = 0
@@ -306,9 +356,14 @@ class ManifoldBot:
         
         # Get all markets from all users in one efficient call
         self.logger.info("🔍 Fetching all markets from monitored users...")
-        all_user_markets = self.reader.get_all_markets(usernames)
+        all_user_markets, initial_balance = self._fetch_with_balance(
+            self.reader.get_all_markets, usernames, limit=markets_per_user
+        )
+        self._balance = initial_balance
+        self._bet_limiter = self._make_bet_limiter(delay_between_bets)
         
-        # Process markets for each user
+        # Process markets for each user, analyzing a market only once even if listed under two users
+        seen_ids: set = set()
         for username in usernames:
             if max_total_bets is not None and bets_placed >= max_total_bets:
                 self.logger.info(f"Reached maximum total bets ({max_total_bets}), stopping")
@@ -321,41 +376,55 @@ class ManifoldBot:
             # Apply limit if specified
             if markets_per_user is not None and len(user_markets) > markets_per_user:
                 user_markets = user_markets[:markets_per_user]
+            user_markets = self._filter_candidates(user_markets, seen_ids)
             
             if not user_markets:
                 self.logger.info(f"  No markets found for @{username}")
                 continue
             
             user_bets_placed = 0
+            position = 0
             
-            for market in user_markets:
-                if (max_total_bets is not None and bets_placed >= max_total_bets) or \
-                   (max_bets_per_user is not None and user_bets_placed >= max_bets_per_user):
+            # Analyze the user's markets in batches (concurrently, if the decision
+            # maker supports it), then place bets one at a time. Each market takes
+            # at most one bet, so a batch no larger than the remaining bet budget
+            # is never analyzed past a cap.
+            while position < len(user_markets):
+                remaining = len(user_markets) - position
+                if max_total_bets is not None:
+                    remaining = min(remaining, max_total_bets - bets_placed)
+                if max_bets_per_user is not None:
+                    remaining = min(remaining, max_bets_per_user - user_bets_placed)
+                if remaining <= 0:
                     break
                 
-                markets_analyzed += 1
+                batch = user_markets[position:position + remaining]
+                position += len(batch)
                 
-                # Analyze the market
-                try:
-                    decision = self.analyze_market(market)
-                    decisions.append(decision)
-                    
-                    if decision.decision != "SKIP":
-                        if self.place_bet_if_decision(decision, bet_amount, filter_metals_only):
-                            bets_placed += 1
-                            user_bets_placed += 1
-                            time.sleep(delay_between_bets)
+                for market, decision in self._analyze_batch(batch, errors):
+                    markets_analyzed += 1
                     
-                except Exception as e:
-                    error_msg = f"Error analyzing market {market.get('id', 'unknown')}: {e}"
-                    self.logger.error(error_msg)
-                    errors.append(error_msg)
+                    try:
+                        decisions.append(decision)
+                        
+                        if decision.decision != "SKIP":
+                            if self.place_bet_if_decision(decision, bet_amount, filter_metals_only, market=market):
+                                bets_placed += 1
+                                user_bets_placed += 1
+                        
+                    except Exception as e:
+                        error_msg = f"Error placing bet on market {market.get('id', 'unknown')}: {e}"
+                        self.logger.error(error_msg)
+                        errors.append(error_msg)
             
             if user_bets_placed > 0:
                 self.logger.info(f"  ✅ Placed {user_bets_placed} bets on @{username}'s markets")
             else:
                 self.logger.info(f"  ⏭️  No bets placed on @{username}'s markets")
         
+        # Reconcile with the server at the end of the session
+        self._balance = None
+        self._bet_limiter = None
         final_balance = self.writer.get_balance()
         
         self.logger.info(f"🏁 Monitoring complete: {bets_placed} bets placed, {markets_analyzed} markets analyzed")
@@ -377,16 +446,29 @@ class ManifoldBot:
         markets: List[Dict[str, Any]],
         bet_amount: int = 10,
         max_bets: int = 5,
-        delay_between_bets: float = 1.0
+        delay_between_bets: float = 1.0,
+        batch_size: int = 8,
+        initial_balance: Optional[float] = None
     ) -> TradingSession:
         """
         Run the bot on a list of markets.
         
+        Markets are analyzed in batches of ``batch_size`` (concurrently, if the
+        decision maker supports it) and bets are then placed one at a time.
+        Each market takes at most one bet, so a batch is also capped at the
+        number of bets still allowed; no market is analyzed once max_bets is reached.
+        The exception is a decision maker with ``use_batch_api`` set: each batch
+        is one Batch API job that may take hours, so batches are not shrunk to
+        the remaining bets (betting still stops at max_bets).
+        
         Args:
             markets: List of market data
             bet_amount: Amount to bet per market
             max_bets: Maximum number of bets to place
             delay_between_bets: Delay between bets in seconds
+            batch_size: Number of markets analyzed per batch
+            initial_balance: Balance at the start of the session, if already
+                fetched (saves a request)
             
         Returns:
             TradingSession object
@@ -394,54 +476,67 @@ class ManifoldBot:
         decisions = []
         bets_placed = 0
         errors = []
-        initial_balance = self.writer.get_balance()
+        if initial_balance is None:
+            initial_balance = self.writer.get_balance()
+        self._balance = initial_balance
+        self._bet_limiter = self._make_bet_limiter(delay_between_bets)
         
+        markets = self._filter_candidates(markets)
         self.logger.info(f"Analyzing {len(markets)} markets...")
         print(f"DEBUG: Starting analysis of {len(markets)} markets...")
         
-        for i, market in enumerate(markets):
+        offline = getattr(self.decision_maker, "use_batch_api", False)
+        position = 0
+        while position < len(markets):
             if bets_placed >= max_bets:
                 self.logger.info(f"Reached maximum bets limit ({max_bets})")
                 break
             
-            self.logger.info(f"Analyzing market {i+1}/{len(markets)}: {market.get('question', '')[:50]}...")
-            print(f"DEBUG: Analyzing market {i+1}/{len(markets)}: {market.get('question', '')[:50]}...")
+            size = max(1, batch_size) if offline else min(max(1, batch_size), max_bets - bets_placed)
+            batch = markets[position:position + size]
+            start, position = position, position + len(batch)
+            for i, market in enumerate(batch, start + 1):
+                self.logger.info("Analyzing market %d/%d: %.50s...", i, len(markets), market.get('question', ''))
+                print(f"DEBUG: Analyzing market {i}/{len(markets)}: {market.get('question', '')[:50]}...")
             
-            try:
-                # Analyze market
-                decision = self.analyze_market(market)
-                decisions.append(decision)
-                
-                # Log decision with more details
-                self.logger.info(
-                    f"Decision: {decision.decision} | "
-                    f"Type: {decision.outcome_type} | "
-                    f"Current: {decision.current_probability:.1%} | "
-                    f"Confidence: {decision.confidence:.1%}"
-                )
-                self.logger.info(f"  Reasoning: {decision.reasoning}")
-                
-                # Also print to console for debugging
-                print(f"DECISION: {decision.decision} | Type: {decision.outcome_type} | Current: {decision.current_probability:.1%} | Confidence: {decision.confidence:.1%}")
-                print(f"  Reasoning: {decision.reasoning}")
-                
-                # Show LLM probability if available
-                if hasattr(decision, 'metadata') and decision.metadata and 'llm_probability' in decision.metadata:
-                    llm_prob = decision.metadata['llm_probability']
-                    prob_diff = decision.metadata.get('probability_difference', 0)
-                    self.logger.info(f"  LLM Probability: {llm_prob:.1%} | Difference: {prob_diff:.1%}")
-                    print(f"  LLM Probability: {llm_prob:.1%} | Difference: {prob_diff:.1%}")
+            for market, decision in self._analyze_batch(batch, errors):
+                if bets_placed >= max_bets:
+                    break
                 
-                if decision.decision != "SKIP":
-                    if self.place_bet_if_decision(decision, bet_amount):
-                        bets_placed += 1
-                        time.sleep(delay_between_bets)  # Rate limiting
-                        
-            except Exception as e:
-                error_msg = f"Error analyzing market {market.get('id', 'unknown')}: {e}"
-                self.logger.error(error_msg)
-                errors.append(error_msg)
+                try:
+                    decisions.append(decision)
+                    
+                    # Log decision with more details
+                    self.logger.info(
+                        "Decision: %s | Type: %s | Current: %.1f%% | Confidence: %.1f%%",
+                        decision.decision, decision.outcome_type,
+                        decision.current_probability * 100, decision.confidence * 100
+                    )
+                    self.logger.info("  Reasoning: %s", decision.reasoning)
+                    
+                    # Also print to console for debugging
+                    print(f"DECISION: {decision.decision} | Type: {decision.outcome_type} | Current: {decision.current_probability:.1%} | Confidence: {decision.confidence:.1%}")
+                    print(f"  Reasoning: {decision.reasoning}")
+                    
+                    # Show LLM probability if available
+                    if hasattr(decision, 'metadata') and decision.metadata and 'llm_probability' in decision.metadata:
+                        llm_prob = decision.metadata['llm_probability']
+                        prob_diff = decision.metadata.get('probability_difference', 0)
+                        self.logger.info("  LLM Probability: %.1f%% | Difference: %.1f%%", llm_prob * 100, prob_diff * 100)
+                        print(f"  LLM Probability: {llm_prob:.1%} | Difference: {prob_diff:.1%}")
+                    
+                    if decision.decision != "SKIP" and bets_placed < max_bets:
+                        if self.place_bet_if_decision(decision, bet_amount, market=market):
+                            bets_placed += 1
+                            
+                except Exception as e:
+                    error_msg = f"Error analyzing market {market.get('id', 'unknown')}: {e}"
+                    self.logger.error(error_msg)
+                    errors.append(error_msg)
         
+        # Reconcile with the server at the end of the session
+        self._balance = None
+        self._bet_limiter = None
         final_balance = self.writer.get_balance()
         
         return TradingSession(
@@ -453,33 +548,129 @@ class ManifoldBot:
             errors=errors
         )
     
+    def _make_bet_limiter(self, delay_between_bets: float) -> Optional[TokenBucket]:
+        """
+        Bet rate limiter for a session.
+        
+        Unlike sleeping after every bet, a bucket only waits when the previous
+        bet was less than delay_between_bets ago, and can be shared across threads.
+        """
+        if self.bet_rate_limit is not None:
+            return self.bet_rate_limit
+        if delay_between_bets <= 0:
+            return None
+        return TokenBucket(rate=1 / delay_between_bets, capacity=1)
+    
+    def _is_candidate(self, market: Dict[str, Any]) -> bool:
+        """
+        Cheap checks run before a market is sent to the decision maker.
+        
+        Markets that place_bet_if_decision would refuse anyway (closed, resolved,
+        non-binary) or that have too little volume are dropped, so an expensive
+        decision maker (e.g. an LLM) never sees them.
+        """
+        if not is_market_tradeable(market):
+            return False
+        if market.get("outcomeType", "BINARY") != "BINARY":
+            return False
+        return market.get("volume", self.min_volume) >= self.min_volume
+    
+    def _filter_candidates(
+        self, markets: List[Dict[str, Any]], seen: Optional[set] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Drop markets that fail _is_candidate or repeat an earlier market, logging how many were dropped.
+        
+        Args:
+            markets: Markets to filter
+            seen: IDs of markets already taken this session; updated in place
+        """
+        seen = set() if seen is None else seen
+        candidates = []
+        for market in markets:
+            market_id = market.get("id")
+            if market_id is not None:
+                if market_id in seen:
+                    continue
+                seen.add(market_id)
+            if self._is_candidate(market):
+                candidates.append(market)
+        if len(candidates) < len(markets):
+            self.logger.info(
+                f"Pre-filtered {len(markets) - len(candidates)} untradeable, low-volume or duplicate markets"
+            )
+        return candidates
+    
+    def _fetch_with_balance(self, fetch: Callable[..., Any], *args: Any, **kwargs: Any) -> Tuple[Any, float]:
+        """
+        Run a market fetch and the starting balance lookup concurrently.
+        
+        Both are blocking HTTP calls, so overlapping them saves a round trip
+        at the start of each session.
+        
+        Returns:
+            Tuple of (fetch result, current balance)
+        """
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            balance = executor.submit(self.writer.get_balance)
+            result = fetch(*args, **kwargs)
+            return result, balance.result()
+    
+    def _analyze_batch(self, markets: List[Dict[str, Any]], errors: List[str]) -> List[tuple]:
+        """
+        Analyze a batch of markets, returning (market, decision) pairs.
+        
+        Falls back to one market at a time if the batch call fails, so a single
+        bad market doesn't lose the decisions for the rest of the batch.
+        """
+        try:
+            return list(zip(markets, self.decision_maker.analyze_markets(markets)))
+        except Exception as e:
+            self.logger.warning(f"Batch analysis failed, analyzing markets individually: {e}")
+        
+        results = []
+        for market in markets:
+            try:
+                results.append((market, self.analyze_market(market)))
+            except Exception as e:
+                error_msg = f"Error analyzing market {market.get('id', 'unknown')}: {e}"
+                self.logger.error(error_msg)
+                errors.append(error_msg)
+        return results
+    
     def run_on_recent_markets(
         self,
         limit: int = 20,
         bet_amount: int = 10,
         max_bets: int = 5,
         delay_between_bets: float = 1.0,
-        username: str = "MikhailTal"
+        username: str = "MikhailTal",
+        batch_size: int = 8
     ) -> TradingSession:
         """
         Run the bot on markets by a specific user (defaults to MikhailTal).
         
         Args:
-            limit: Number of markets to analyze (ignored, gets all user markets)
+            limit: Number of most recent markets to analyze (0 = all user markets)
             bet_amount: Amount to bet per market
             max_bets: Maximum number of bets to place
             delay_between_bets: Delay between bets in seconds
             username: Username to get markets from (default: "MikhailTal")
+            batch_size: Number of markets analyzed per batch (see run_on_markets)
             
         Returns:
             TradingSession object
         """
-        # Get all markets by the specified user (defaults to MikhailTal)
-        markets = self.reader.get_all_markets(usernames=username)
+        # Get the most recent markets by the specified user (defaults to MikhailTal)
+        markets, initial_balance = self._fetch_with_balance(
+            self.reader.get_all_markets, usernames=username, limit=limit or None
+        )
         # Limit to the specified number if requested
         if limit and len(markets) > limit:
             markets = markets[:limit]
-        return self.run_on_markets(markets, bet_amount, max_bets, delay_between_bets)
+        return self.run_on_markets(
+            markets, bet_amount, max_bets, delay_between_bets, batch_size=batch_size, initial_balance=initial_balance
+        )
     
     def run_on_user_markets(
         self,
@@ -487,7 +678,8 @@ class ManifoldBot:
         limit: int = 20,
         bet_amount: int = 10,
         max_bets: int = 5,
-        delay_between_bets: float = 1.0
+        delay_between_bets: float = 1.0,
+        batch_size: int = 8
     ) -> TradingSession:
         """
         Run the bot on markets created by a specific user.
@@ -498,6 +690,7 @@ class ManifoldBot:
             bet_amount: Amount to bet per market
             max_bets: Maximum number of bets to place
             delay_between_bets: Delay between bets in seconds
+            batch_size: Number of markets analyzed per batch (see run_on_markets)
             
         Returns:
             TradingSession object
@@ -506,7 +699,9 @@ class ManifoldBot:
         
         try:
             # Get all markets created by this user using the working method
-            markets = self.reader.get_all_markets(usernames=username)
+            markets, initial_balance = self._fetch_with_balance(
+                self.reader.get_all_markets, usernames=username, limit=limit or None
+            )
             self.logger.info(f"Found {len(markets)} markets created by {username}")
             
             # Limit to the specified number if requested
@@ -514,16 +709,20 @@ class ManifoldBot:
                 markets = markets[:limit]
                 self.logger.info(f"Limited to {len(markets)} markets for analysis")
             
-            return self.run_on_markets(markets, bet_amount, max_bets, delay_between_bets)
+            return self.run_on_markets(
+                markets, bet_amount, max_bets, delay_between_bets,
+                batch_size=batch_size, initial_balance=initial_balance
+            )
             
         except Exception as e:
             error_msg = f"Error getting markets for user {username}: {e}"
             self.logger.error(error_msg)
+            balance = self.writer.get_balance()
             return TradingSession(
                 markets_analyzed=0,
                 bets_placed=0,
-                initial_balance=self.writer.get_balance(),
-                final_balance=self.writer.get_balance(),
+                initial_balance=balance,
+                final_balance=balance,
                 decisions=[],
                 errors=[error_msg]
             )
@@ -663,8 +862,7 @@ class KellyCriterionDecisionMaker(DecisionMaker):
         if market_subsidy <= 0 or bet_amount <= 0:
             return 0.0
         
-        calculator = LMSRCalculator(market_subsidy)
-        return calculator.calculate_market_impact(bet_amount, current_prob, outcome)
+        return get_calculator(market_subsidy).calculate_market_impact(bet_amount, current_prob, outcome)
     
     def calculate_kelly_bet(self, true_prob: float, market_prob: float, bankroll: float, market_subsidy: float = None) -> float:
         """
@@ -683,9 +881,6 @@ class KellyCriterionDecisionMaker(DecisionMaker):
         if market_prob <= 0 or market_prob >= 1 or true_prob <= 0 or true_prob >= 1:
             return 0.0
         
-        # Determine bet direction
-        outcome = "YES" if true_prob > market_prob else "NO"
-        
         # If no market subsidy, use simple Kelly with current probability
         if not market_subsidy or market_subsidy <= 0:
             b = (1 / market_prob) - 1
@@ -695,50 +890,51 @@ class KellyCriterionDecisionMaker(DecisionMaker):
             kelly_bet = kelly_fraction * self.kelly_fraction * bankroll
             return max(self.min_bet, min(kelly_bet, self.max_bet))
         
-        # Use iterative approach to find optimal bet size
-        # We need to find bet size where Kelly Criterion is satisfied with marginal probability
-        calculator = LMSRCalculator(market_subsidy)
+        # Find the bet size where Kelly is satisfied with the marginal probability
+        return kelly_bet_with_impact(
+            true_prob, market_prob, bankroll, market_subsidy,
+            self.kelly_fraction, self.max_prob_impact, self.min_bet, self.max_bet
+        )
+    
+    def calculate_kelly_bets(
+        self,
+        true_probs: Sequence[float],
+        market_probs: Sequence[float],
+        bankroll: float,
+        market_subsidies: Union[float, Sequence[Optional[float]], None] = None
+    ) -> List[float]:
+        """
+        Calculate Kelly bet sizes for many markets at once.
         
-        # Binary search for optimal bet size
-        low, high = 0.0, min(bankroll, self.max_bet)
+        Same result as calling calculate_kelly_bet per market. Sweeps over many
+        markets should call this once rather than loop themselves.
         
-        for _ in range(50):  # More iterations for precision
-            mid = (low + high) / 2
-            
-            # Calculate marginal probability for this bet size
-            marginal_prob = calculator.calculate_marginal_probability(mid, market_prob, outcome)
-            
-            # Calculate Kelly fraction with marginal probability
-            b = (1 / marginal_prob) - 1
-            kelly_fraction = (b * true_prob - (1 - true_prob)) / b
-            
-            # Calculate desired bet size based on Kelly
-            desired_bet = kelly_fraction * self.kelly_fraction * bankroll
-            
-            # Check if this bet size respects impact limits
-            impact = calculator.calculate_market_impact(mid, market_prob, outcome)
+        Args:
+            true_probs: Estimated true probability per market
+            market_probs: Current market probability per market
+            bankroll: Current bankroll (shared by all markets)
+            market_subsidies: Subsidy per market, or one value (or None) for all
             
-            if kelly_fraction <= 0 or impact > self.max_prob_impact:
-                # No positive edge or impact too high
-                high = mid
-            elif abs(mid - desired_bet) < 0.01:  # Close enough
-                break
-            elif mid < desired_bet:
-                low = mid
-            else:
-                high = mid
-        
-        bet_amount = max(self.min_bet, min(mid, self.max_bet))
-        
-        return bet_amount
+        Returns:
+            Bet sizes, in the same order as the inputs
+        """
+        if market_subsidies is None or isinstance(market_subsidies, (int, float)):
+            market_subsidies = [market_subsidies] * len(true_probs)
+        if not len(true_probs) == len(market_probs) == len(market_subsidies):
+            raise ValueError("true_probs, market_probs and market_subsidies must have the same length")
+        
+        calculate = self.calculate_kelly_bet
+        return [
+            calculate(true_prob, market_prob, bankroll, subsidy)
+            for true_prob, market_prob, subsidy in zip(true_probs, market_probs, market_subsidies)
+        ]
     
     def _find_max_bet_by_impact(self, current_prob: float, market_subsidy: float, outcome: str, max_impact: float) -> float:
         """
         Find the maximum bet size that doesn't exceed the probability impact limit.
         Uses the LMSR calculator for accurate results.
         """
-        calculator = LMSRCalculator(market_subsidy)
-        return calculator.find_max_bet_by_impact(current_prob, outcome, max_impact)
+        return get_calculator(market_subsidy).find_max_bet_by_impact(current_prob, outcome, max_impact)
     
     def analyze_market(self, market: Dict[str, Any], bankroll: float = 100.0) -> MarketDecision:
         """
@@ -779,11 +975,17 @@ class KellyCriterionDecisionMaker(DecisionMaker):
             outcome_type=market.get('outcomeType', 'UNKNOWN')
         )
         
-        # Calculate Kelly bet size with market impact limits
-        kelly_bet = self.calculate_kelly_bet(true_prob, current_prob, bankroll, market_subsidy)
-        
-        # Calculate market impact for reporting
-        market_impact = self.calculate_market_impact(kelly_bet, current_prob, market_subsidy, decision) if market_subsidy > 0 else 0
+        # Size the bet and report its impact with the same model: the market's own
+        # CPMM pool when it has one, otherwise LMSR with the market subsidy
+        kelly_bet = calculate_cpmm_kelly_bet(
+            market, true_prob, decision, bankroll,
+            self.kelly_fraction, self.max_prob_impact, self.min_bet, self.max_bet
+        )
+        if kelly_bet is not None:
+            market_impact = calculate_cpmm_impact(market, kelly_bet, decision)
+        else:
+            kelly_bet = self.calculate_kelly_bet(true_prob, current_prob, bankroll, market_subsidy)
+            market_impact = self.calculate_market_impact(kelly_bet, current_prob, market_subsidy, decision) if market_subsidy > 0 else 0
         
         return MarketDecision(
             market_id=market_id,
@@ -896,7 +1098,23 @@ class ConfidenceBasedDecisionMaker(DecisionMaker):
 class LLMDecisionMaker(DecisionMaker):
     """Decision maker that uses an LLM to analyze markets."""
     
-    def __init__(self, openai_api_key: str, min_confidence: float = 0.6, model: str = "gpt-4"):
+    def __init__(
+        self,
+        openai_api_key: str,
+        min_confidence: float = 0.6,
+        model: str = "gpt-4",
+        max_concurrent: int = 8,
+        cache: Union[LLMCache, bool] = False,
+        semantic_cache: Optional[SemanticCache] = None,
+        probability_bucket: Optional[float] = None,
+        stream: bool = False,
+        batch_size: int = 1,
+        use_batch_api: bool = False,
+        json_mode: bool = False,
+        skip_reasoning: bool = False,
+        screening_model: Optional[str] = None,
+        cascade_threshold: float = 0.03
+    ):
         """
         Initialize LLM decision maker.
         
@@ -904,10 +1122,55 @@ class LLMDecisionMaker(DecisionMaker):
             openai_api_key: OpenAI API key
             min_confidence: Minimum confidence threshold for placing bets
             model: GPT model to use
+            max_concurrent: Maximum number of concurrent OpenAI requests in analyze_markets
+            cache: LLMCache to reuse analyses of identical prompts (True for an
+                in-memory cache; off by default). Enabling it switches requests to
+                temperature 0, so that a cached answer is the one a repeat request
+                would get, and memoizes decisions per (market id, probability to 3dp).
+            semantic_cache: Optional SemanticCache to reuse analyses of near-duplicate
+                questions; the decision is still made against each market's own probability
+            probability_bucket: Round the market probability shown to the LLM to this
+                grid (e.g. 0.05), so a market whose price drifts slightly still hits
+                the cache. The LLM sees a coarser price; decisions use the exact one.
+                None (the default) shows the exact price.
+            stream: Stream completions and stop reading once the answer is complete
+            batch_size: Markets per OpenAI request in analyze_markets. Above 1, markets
+                are packed into one JSON-mode prompt per batch (see analyze_markets_with_gpt),
+                which amortizes the instructions. semantic_cache is checked for the
+                whole batch with one embedding request; stream is ignored.
+            use_batch_api: Send analyze_markets through OpenAI's Batch API (half price,
+                but blocks until the job finishes, up to 24h). For offline scans;
+                pass a large batch_size to ManifoldBot.run_on_markets (or
+                run_on_user_markets / run_on_recent_markets) so the whole scan is one job.
+            json_mode: Ask for single-market answers as a JSON object
+                (response_format=json_object) rather than free-text lines
+            skip_reasoning: With stream, stop reading once PROBABILITY and CONFIDENCE
+                are in, skipping the reasoning the decision doesn't need
+            screening_model: Cheaper model (e.g. "gpt-4o-mini") that analyzes every
+                market first; only markets where it sees an edge of at least
+                cascade_threshold, with near-sufficient confidence, are re-analyzed
+                with ``model``. None sends every market straight to ``model``.
+            cascade_threshold: Minimum |screening probability - market probability|
+                for a market to be confirmed with ``model``
         """
         self.openai_api_key = openai_api_key
         self.min_confidence = min_confidence
         self.model = model
+        self.max_concurrent = max_concurrent
+        if cache is True:
+            cache = LLMCache()
+        self.cache = cache or None
+        self.temperature = 0.0 if self.cache is not None else None
+        self.semantic_cache = semantic_cache
+        self.probability_bucket = probability_bucket
+        self.stream = stream
+        self.batch_size = batch_size
+        self.use_batch_api = use_batch_api
+        self.json_mode = json_mode
+        self.skip_reasoning = skip_reasoning
+        self.screening_model = screening_model
+        self.cascade_threshold = cascade_threshold
+        self._decisions: Dict[Tuple[str, float], MarketDecision] = {}
     
     def analyze_market(self, market: Dict[str, Any]) -> MarketDecision:
         """
@@ -921,56 +1184,241 @@ class LLMDecisionMaker(DecisionMaker):
         """
         from ..ai import analyze_market_with_gpt
         
-        question = market.get("question", "")
-        description = market.get("description", "")
-        current_prob = market.get("probability", 0.5)
-        market_id = market.get("id", "")
+        key = self._decision_key(market)
+        if key in self._decisions:
+            return self._decisions[key]
         
         try:
-            result = analyze_market_with_gpt(
-                question=question,
-                description=description,
-                current_probability=current_prob,
-                model=self.model,
-                api_key=self.openai_api_key
+            result = analyze_market_with_gpt(**self._analysis_kwargs(market, self.screening_model or self.model))
+            if self._needs_confirmation(market, result):
+                result = {**analyze_market_with_gpt(**self._analysis_kwargs(market, self.model)), "screening": result}
+            return self._decide(market, result, key)
+            
+        except Exception as e:
+            return self._error_decision(market, e)
+    
+    async def analyze_market_async(self, market: Dict[str, Any], client: Optional[Any] = None) -> MarketDecision:
+        """
+        Async version of analyze_market.
+        
+        Args:
+            market: Market data from Manifold API
+            client: Optional openai.AsyncOpenAI client to reuse
+            
+        Returns:
+            MarketDecision object
+        """
+        from ..ai import analyze_market_with_gpt_async
+        
+        key = self._decision_key(market)
+        if key in self._decisions:
+            return self._decisions[key]
+        
+        try:
+            result = await analyze_market_with_gpt_async(
+                **self._analysis_kwargs(market, self.screening_model or self.model), client=client
             )
+            if self._needs_confirmation(market, result):
+                confirmed = await analyze_market_with_gpt_async(
+                    **self._analysis_kwargs(market, self.model), client=client
+                )
+                result = {**confirmed, "screening": result}
+            return self._decide(market, result, key)
             
-            llm_prob = result["llm_probability"]
-            confidence = result["confidence"]
-            reasoning = result["reasoning"]
+        except Exception as e:
+            return self._error_decision(market, e)
+    
+    async def analyze_markets_async(self, markets: List[Dict[str, Any]]) -> List[MarketDecision]:
+        """
+        Analyze markets concurrently, at most ``max_concurrent`` requests at a time.
+        
+        Args:
+            markets: Market data from Manifold API
             
-            # Make trading decision
-            prob_diff = abs(llm_prob - current_prob)
-            decision = "SKIP"
+        Returns:
+            List of MarketDecision objects, in the same order as markets
+        """
+        import openai
+        from ..ai.openai_client import OPENAI_MAX_RETRIES
+        
+        semaphore = asyncio.Semaphore(max(1, self.max_concurrent))
+        
+        async with openai.AsyncOpenAI(
+            api_key=self.openai_api_key, max_retries=OPENAI_MAX_RETRIES
+        ) as client:
+            async def bounded(market: Dict[str, Any]) -> MarketDecision:
+                async with semaphore:
+                    return await self.analyze_market_async(market, client=client)
             
-            if prob_diff >= 0.05 and confidence >= self.min_confidence:  # 5% difference threshold
-                if llm_prob > current_prob:
-                    decision = "YES"
-                else:
-                    decision = "NO"
+            return await asyncio.gather(*[bounded(market) for market in markets])
+    
+    def analyze_markets(self, markets: List[Dict[str, Any]]) -> List[MarketDecision]:
+        """
+        Analyze markets concurrently (see analyze_markets_async).
+        
+        Safe to call from synchronous code or from inside a running event loop.
+        
+        Args:
+            markets: Market data from Manifold API
             
-            return MarketDecision(
-                market_id=market_id,
-                question=question,
-                current_probability=current_prob,
-                decision=decision,
-                confidence=confidence,
-                reasoning=reasoning,
-                outcome_type=market.get('outcomeType', 'UNKNOWN'),
-                metadata={
-                    "llm_probability": llm_prob,
-                    "probability_difference": prob_diff,
-                    "model": self.model
+        Returns:
+            List of MarketDecision objects, in the same order as markets
+        """
+        if len(markets) <= 1:
+            return [self.analyze_market(market) for market in markets]
+        if self.use_batch_api or self.batch_size > 1:
+            return self._analyze_markets_batched(markets)
+        
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.analyze_markets_async(markets))
+        
+        # Called from inside an event loop (e.g. a notebook): asyncio.run would
+        # fail here, so run the fan-out on its own loop in a worker thread
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, self.analyze_markets_async(markets)).result()
+    
+    def _analyze_markets_batched(self, markets: List[Dict[str, Any]]) -> List[MarketDecision]:
+        """Analyze markets with batch_size markets per OpenAI request, or as one Batch API job."""
+        from ..ai import analyze_markets_with_batch_api, analyze_markets_with_gpt
+        
+        keys = [self._decision_key(market) for market in markets]
+        decisions: List[Optional[MarketDecision]] = [self._decisions.get(key) for key in keys]
+        pending = [i for i, decision in enumerate(decisions) if decision is None]
+        
+        if pending:
+            prompts = [
+                {
+                    "question": markets[i].get("question", ""),
+                    "description": markets[i].get("description", ""),
+                    "current_probability": self._prompt_probability(markets[i])
                 }
-            )
+                for i in pending
+            ]
             
-        except Exception as e:
-            return MarketDecision(
-                market_id=market_id,
-                question=question,
-                current_probability=current_prob,
-                decision="SKIP",
-                confidence=0.0,
-                reasoning=f"Error: {str(e)}",
-                outcome_type=market.get('outcomeType', 'UNKNOWN')
-            )
+            def analyze(prompts: List[Dict[str, Any]], model: str) -> List[Dict[str, Any]]:
+                options = dict(model=model, api_key=self.openai_api_key, temperature=self.temperature, cache=self.cache)
+                if self.use_batch_api:
+                    return analyze_markets_with_batch_api(prompts, **options)
+                return analyze_markets_with_gpt(
+                    prompts, batch_size=self.batch_size, semantic_cache=self.semantic_cache, **options
+                )
+            
+            try:
+                results = analyze(prompts, self.screening_model or self.model)
+                # Confirm the screened prospects with the main model in one more batch
+                confirm = [
+                    j for j, result in enumerate(results) if self._needs_confirmation(markets[pending[j]], result)
+                ]
+                if confirm:
+                    confirmed = analyze([prompts[j] for j in confirm], self.model)
+                    for j, result in zip(confirm, confirmed):
+                        results[j] = {**result, "screening": results[j]}
+                for i, result in zip(pending, results):
+                    decisions[i] = self._decide(markets[i], result, keys[i])
+            except Exception as e:
+                for i in pending:
+                    decisions[i] = self._error_decision(markets[i], e)
+        
+        return decisions
+    
+    def _analysis_kwargs(self, market: Dict[str, Any], model: str) -> Dict[str, Any]:
+        """Keyword arguments for analyze_market_with_gpt(_async) on market with model."""
+        return dict(
+            question=market.get("question", ""),
+            description=market.get("description", ""),
+            current_probability=self._prompt_probability(market),
+            model=model,
+            api_key=self.openai_api_key,
+            temperature=self.temperature,
+            cache=self.cache,
+            semantic_cache=self.semantic_cache,
+            stream=self.stream,
+            json_mode=self.json_mode,
+            skip_reasoning=self.skip_reasoning
+        )
+    
+    def _needs_confirmation(self, market: Dict[str, Any], result: Dict[str, Any]) -> bool:
+        """Whether a screening_model result shows enough edge to re-ask the main model."""
+        if not self.screening_model or not result.get("success", True):
+            return False
+        edge = abs(result["llm_probability"] - market.get("probability", 0.5))
+        return edge >= self.cascade_threshold and result["confidence"] >= self.min_confidence - 0.1
+    
+    def _decision_key(self, market: Dict[str, Any]) -> Optional[Tuple[str, float]]:
+        """Memo key for a market's decision, or None if it should not be memoized."""
+        market_id = market.get("id")
+        if self.cache is None or not market_id:
+            return None
+        return (market_id, round(market.get("probability", 0.5), 3))
+    
+    def _decide(
+        self, market: Dict[str, Any], result: Dict[str, Any], key: Optional[Tuple[str, float]]
+    ) -> MarketDecision:
+        """Make the decision for an analysis result, memoizing it under key if the analysis succeeded."""
+        decision = self._make_decision(market, result)
+        if key is not None and result.get("success", True):
+            self._decisions[key] = decision
+        return decision
+    
+    def _prompt_probability(self, market: Dict[str, Any]) -> float:
+        """Market probability as shown to the LLM, rounded to probability_bucket."""
+        prob = market.get("probability", 0.5)
+        if not self.probability_bucket:
+            return prob
+        return round(prob / self.probability_bucket) * self.probability_bucket
+    
+    def _make_decision(self, market: Dict[str, Any], result: Dict[str, Any]) -> MarketDecision:
+        """Turn an analyze_market_with_gpt result into a trading decision."""
+        current_prob = market.get("probability", 0.5)
+        llm_prob = result["llm_probability"]
+        confidence = result["confidence"]
+        reasoning = result["reasoning"]
+        
+        # Make trading decision
+        prob_diff = abs(llm_prob - current_prob)
+        decision = "SKIP"
+        
+        if prob_diff >= 0.05 and confidence >= self.min_confidence:  # 5% difference threshold
+            if llm_prob > current_prob:
+                decision = "YES"
+            else:
+                decision = "NO"
+        
+        metadata = {
+            "llm_probability": llm_prob,
+            "probability_difference": prob_diff,
+            "model": result.get("model_used", self.model)
+        }
+        screening = result.get("screening")
+        if screening is not None:
+            # Keep the cheap model's answer for auditing the cascade
+            metadata["screening"] = {
+                "model": screening.get("model_used", self.screening_model),
+                "llm_probability": screening["llm_probability"],
+                "confidence": screening["confidence"]
+            }
+        
+        return MarketDecision(
+            market_id=market.get("id", ""),
+            question=market.get("question", ""),
+            current_probability=current_prob,
+            decision=decision,
+            confidence=confidence,
+            reasoning=reasoning,
+            outcome_type=market.get('outcomeType', 'UNKNOWN'),
+            metadata=metadata
+        )
+    
+    def _error_decision(self, market: Dict[str, Any], error: Exception) -> MarketDecision:
+        """Build the SKIP decision returned when analysis fails."""
+        return MarketDecision(
+            market_id=market.get("id", ""),
+            question=market.get("question", ""),
+            current_probability=market.get("probability", 0.5),
+            decision="SKIP",
+            confidence=0.0,
+            reasoning=f"Error: {str(error)}",
+            outcome_type=market.get('outcomeType', 'UNKNOWN')
+        )
@@ -0,0 +1,191 @@
+"""
+Constant Product Market Maker (CPMM) calculations for Manifold Markets.
+
+Binary Manifold markets (mechanism "cpmm-1") price bets from the market's
+``pool`` of YES/NO shares and its weight ``p``, both included in the market
+JSON. That makes a bet's price impact computable locally from a market we
+already fetched, without another request.
+
+Fees are ignored, so results are slightly optimistic for the bettor.
+"""
+
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+
+def cpmm_probability(pool: Mapping[str, float], p: float) -> float:
+    """
+    Market probability implied by a pool.
+
+    Args:
+        pool: Shares in the pool, {"YES": y, "NO": n}
+        p: Pool weight (0.5 for markets created at 50%)
+
+    Returns:
+        Probability of YES
+    """
+    yes, no = pool["YES"], pool["NO"]
+    return p * no / ((1 - p) * yes + p * no)
+
+
+def cpmm_pool_after_bet(pool: Mapping[str, float], p: float, bet_amount: float, outcome: str) -> Tuple[float, float]:
+    """
+    Pool after buying ``outcome`` for ``bet_amount`` mana.
+
+    The bet adds bet_amount to both sides of the pool, then the bettor takes
+    shares of their outcome out until the invariant y^p * n^(1-p) is restored.
+
+    Args:
+        pool: Shares in the pool, {"YES": y, "NO": n}
+        p: Pool weight
+        bet_amount: Mana spent
+        outcome: "YES" or "NO"
+
+    Returns:
+        Tuple of (YES shares, NO shares) left in the pool
+    """
+    yes, no = pool["YES"], pool["NO"]
+    k = yes ** p * no ** (1 - p)
+    if outcome == "YES":
+        no += bet_amount
+        yes = (k / no ** (1 - p)) ** (1 / p)
+    else:
+        yes += bet_amount
+        no = (k / yes ** p) ** (1 / (1 - p))
+    return yes, no
+
+
+def _market_pool(market: Dict[str, Any]) -> Optional[Tuple[float, float, float]]:
+    """The market's (YES shares, NO shares, p), or None if it has no usable CPMM pool."""
+    pool = market.get("pool")
+    p = market.get("p")
+    if not pool or p is None or "YES" not in pool or "NO" not in pool or not 0 < p < 1:
+        return None
+    return pool["YES"], pool["NO"], p
+
+
+def calculate_cpmm_impacts(
+    market: Dict[str, Any], bet_amounts: Sequence[float], outcome: str
+) -> Optional[List[float]]:
+    """
+    Price impact of each of several bet sizes, from the market's own pool.
+
+    The invariant and starting price are computed once, so each bet costs a
+    single power and a few arithmetic operations on floats.
+
+    Args:
+        market: Market data as returned by the API
+        bet_amounts: Mana spent, per bet
+        outcome: "YES" or "NO"
+
+    Returns:
+        Absolute change in probability for each bet, or None if the market has no CPMM pool
+    """
+    pool = _market_pool(market)
+    if pool is None:
+        return None
+    yes, no, p = pool
+    q = 1 - p
+    before = p * no / (q * yes + p * no)
+
+    impacts = []
+    if outcome == "YES":
+        # Solving y'^p * (n+a)^(1-p) = k for y' gives y' = y * (n / (n+a))^((1-p)/p)
+        exponent = q / p
+        for amount in bet_amounts:
+            if amount <= 0:
+                impacts.append(0.0)
+                continue
+            new_no = no + amount
+            new_yes = yes * (no / new_no) ** exponent
+            impacts.append(abs(p * new_no / (q * new_yes + p * new_no) - before))
+    else:
+        exponent = p / q
+        for amount in bet_amounts:
+            if amount <= 0:
+                impacts.append(0.0)
+                continue
+            new_yes = yes + amount
+            new_no = no * (yes / new_yes) ** exponent
+            impacts.append(abs(p * new_no / (q * new_yes + p * new_no) - before))
+    return impacts
+
+
+def calculate_cpmm_impact(market: Dict[str, Any], bet_amount: float, outcome: str) -> Optional[float]:
+    """
+    Price impact of a bet, from the market's own pool.
+
+    Args:
+        market: Market data as returned by the API
+        bet_amount: Mana spent
+        outcome: "YES" or "NO"
+
+    Returns:
+        Absolute change in probability, or None if the market has no CPMM pool
+    """
+    impacts = calculate_cpmm_impacts(market, (bet_amount,), outcome)
+    return None if impacts is None else impacts[0]
+
+
+def calculate_cpmm_kelly_bet(
+    market: Dict[str, Any],
+    true_prob: float,
+    outcome: str,
+    bankroll: float,
+    kelly_fraction: float,
+    max_prob_impact: float,
+    min_bet: float,
+    max_bet: float
+) -> Optional[float]:
+    """
+    Fractional Kelly bet sized against the marginal CPMM price, within an impact limit.
+    
+    The CPMM counterpart of lmsr.kelly_bet_with_impact: bisects for the largest
+    bet that is no more than the Kelly size at the price after the bet, and
+    whose impact (as reported by calculate_cpmm_impact) is within max_prob_impact.
+    
+    Args:
+        market: Market data as returned by the API
+        true_prob: Estimated true probability of YES
+        outcome: "YES" or "NO"
+        bankroll: Current bankroll
+        kelly_fraction: Fraction of the Kelly bet to use
+        max_prob_impact: Maximum allowed probability change
+        min_bet: Minimum bet amount
+        max_bet: Maximum bet amount
+        
+    Returns:
+        Bet amount clipped to [min_bet, max_bet], or None if the market has no CPMM pool
+    """
+    pool = _market_pool(market)
+    if pool is None:
+        return None
+    yes, no, p = pool
+    q = 1 - p
+    before = p * no / (q * yes + p * no)
+    buy_yes = outcome == "YES"
+    exponent = q / p if buy_yes else p / q
+    scale = kelly_fraction * bankroll
+    
+    low, high = 0.0, min(bankroll, max_bet)
+    while high - low >= 0.01:
+        mid = (low + high) / 2
+        if buy_yes:
+            new_no = no + mid
+            new_yes = yes * (no / new_no) ** exponent
+        else:
+            new_yes = yes + mid
+            new_no = no * (yes / new_yes) ** exponent
+        marginal_prob = p * new_no / (q * new_yes + p * new_no)
+        
+        # Kelly fraction for buying the outcome at the marginal price
+        if buy_yes:
+            edge_fraction = (true_prob - marginal_prob) / (1 - marginal_prob)
+        else:
+            edge_fraction = (marginal_prob - true_prob) / marginal_prob
+        
+        if edge_fraction > 0 and abs(marginal_prob - before) <= max_prob_impact and mid <= edge_fraction * scale:
+            low = mid
+        else:
+            high = mid
+    
+    return max(min_bet, min(low, max_bet))
@@ -8,7 +8,12 @@ This module provides accurate calculations for:
 """
 
 import math
-from typing import Tuple, Optional
+from functools import lru_cache
+from typing import List, Optional, Sequence, Tuple
+
+# Natural logs are taken as log2(x) * ln(2): math.log's optional base argument
+# makes each call roughly 3x slower to dispatch in CPython than math.log2.
+_LN2 = math.log(2)
 
 
 class LMSRCalculator:
@@ -46,19 +51,25 @@ class LMSRCalculator:
         """
         if prob <= 0 or prob >= 1:
             raise ValueError(f"Probability must be between 0 and 1, got {prob}")
-        return math.log(prob / (1 - prob))
+        return math.log2(prob / (1 - prob)) * _LN2
     
     def log_odds_to_probability(self, log_odds: float) -> float:
         """
         Convert log-odds to probability.
         
+        Uses the stable logistic form, exponentiating only non-positive values,
+        so very large bets saturate at 0 or 1 instead of overflowing.
+        
         Args:
             log_odds: Log-odds value
             
         Returns:
             Probability (0.0 to 1.0)
         """
-        return 1 / (1 + math.exp(-log_odds))
+        if log_odds >= 0:
+            return 1 / (1 + math.exp(-log_odds))
+        odds = math.exp(log_odds)
+        return odds / (1 + odds)
     
     def calculate_market_impact(self, bet_amount: float, current_prob: float, outcome: str) -> float:
         """
@@ -72,31 +83,37 @@ class LMSRCalculator:
         Returns:
             Absolute change in probability (0.0 to 1.0)
         """
+        return self.calculate_marginal_and_impact(bet_amount, current_prob, outcome)[1]
+    
+    def calculate_marginal_and_impact(
+        self, bet_amount: float, current_prob: float, outcome: str
+    ) -> Tuple[float, float]:
+        """
+        Calculate the marginal probability and the market impact of a bet together.
+        
+        The impact is just the distance from the marginal price to the current
+        one, so both come from a single exp.
+        
+        Args:
+            bet_amount: Amount of the bet
+            current_prob: Current market probability
+            outcome: "YES" or "NO"
+            
+        Returns:
+            Tuple of (marginal probability, absolute change in probability)
+        """
         if bet_amount <= 0:
-            return 0.0
+            return current_prob, 0.0
         
         if outcome not in ["YES", "NO"]:
             raise ValueError(f"Outcome must be 'YES' or 'NO', got {outcome}")
         
-        # Convert current probability to log-odds
-        current_log_odds = self.probability_to_log_odds(current_prob)
-        
-        # Calculate the change in log-odds from the bet
-        if outcome == "YES":
-            # Betting YES increases the log-odds
-            log_odds_change = bet_amount / self.b
-        else:  # NO
-            # Betting NO decreases the log-odds
-            log_odds_change = -bet_amount / self.b
-        
-        # New log-odds
-        new_log_odds = current_log_odds + log_odds_change
+        if current_prob <= 0 or current_prob >= 1:
+            raise ValueError(f"Probability must be between 0 and 1, got {current_prob}")
         
-        # Convert back to probability
-        new_prob = self.log_odds_to_probability(new_log_odds)
-        
-        # Return absolute change in probability
-        return abs(new_prob - current_prob)
+        sign = 1.0 if outcome == "YES" else -1.0
+        marginal_prob = self.calculate_marginal_probability_signed(bet_amount, current_prob, sign)
+        return marginal_prob, abs(marginal_prob - current_prob)
     
     def calculate_new_probability(self, bet_amount: float, current_prob: float, outcome: str) -> float:
         """
@@ -131,6 +148,68 @@ class LMSRCalculator:
         # Convert back to probability
         return self.log_odds_to_probability(new_log_odds)
     
+    def calculate_new_probabilities(
+        self, bet_amounts: Sequence[float], current_prob: float, outcome: str
+    ) -> List[float]:
+        """
+        Calculate the new market probability for each of several bet sizes.
+        
+        Equivalent to calling calculate_new_probability per bet, but uses the
+        closed form p' = p*r / (p*r + 1 - p) with r = exp(+/-bet/b), so each bet
+        costs a single exp and the starting log-odds are never computed.
+        
+        Args:
+            bet_amounts: Bet sizes to evaluate
+            current_prob: Current market probability
+            outcome: "YES" or "NO"
+            
+        Returns:
+            New market probability after each bet, in the same order
+        """
+        if current_prob <= 0 or current_prob >= 1:
+            raise ValueError(f"Probability must be between 0 and 1, got {current_prob}")
+        
+        if outcome not in ["YES", "NO"]:
+            raise ValueError(f"Outcome must be 'YES' or 'NO', got {outcome}")
+        
+        sign = 1.0 if outcome == "YES" else -1.0
+        no_prob = 1 - current_prob
+        new_probs = []
+        
+        for bet_amount in bet_amounts:
+            if bet_amount <= 0:
+                new_probs.append(current_prob)
+                continue
+            
+            shift = sign * bet_amount / self.b
+            if shift > 0:
+                # Divide through by r so exp never overflows
+                new_probs.append(current_prob / (current_prob + no_prob * math.exp(-shift)))
+            else:
+                scaled = current_prob * math.exp(shift)
+                new_probs.append(scaled / (scaled + no_prob))
+        
+        return new_probs
+    
+    def calculate_market_impacts(
+        self, bet_amounts: Sequence[float], current_prob: float, outcome: str
+    ) -> List[float]:
+        """
+        Calculate the market impact of each of several bet sizes.
+        
+        Args:
+            bet_amounts: Bet sizes to evaluate
+            current_prob: Current market probability
+            outcome: "YES" or "NO"
+            
+        Returns:
+            Absolute change in probability for each bet, in the same order
+        """
+        return [
+            abs(new_prob - current_prob)
+            for new_prob in self.calculate_new_probabilities(bet_amounts, current_prob, outcome)
+        ]
+    
     def find_max_bet_by_impact(self, current_prob: float, outcome: str, max_impact: float) -> float:
         """
         Find the maximum bet size that doesn't exceed the probability impact limit.
@@ -146,19 +225,19 @@ class LMSRCalculator:
         if max_impact <= 0 or max_impact >= 1:
             raise ValueError(f"Max impact must be between 0 and 1, got {max_impact}")
         
-        # Binary search to find max bet
-        low, high = 0.0, self.b * 10  # Start with 10x liquidity as upper bound
+        if outcome not in ["YES", "NO"]:
+            raise ValueError(f"Outcome must be 'YES' or 'NO', got {outcome}")
         
-        for _ in range(50):  # More iterations for precision
-            mid = (low + high) / 2
-            impact = self.calculate_market_impact(mid, current_prob, outcome)
-            
-            if impact <= max_impact:
-                low = mid
-            else:
-                high = mid
+        # Invert the LMSR price: the bet that moves the price to current +/- max_impact.
+        # Bets are capped at 10x liquidity.
+        current_log_odds = self.probability_to_log_odds(current_prob)
+        upper = self.b * 10
+        target_prob = current_prob + max_impact if outcome == "YES" else current_prob - max_impact
+        if target_prob <= 0 or target_prob >= 1:
+            return upper
         
-        return low
+        log_odds_change = abs(self.probability_to_log_odds(target_prob) - current_log_odds)
+        return min(self.b * log_odds_change, upper)
     
     def calculate_bet_cost(self, bet_amount: float, current_prob: float, outcome: str) -> float:
         """
@@ -207,8 +286,34 @@ class LMSRCalculator:
         if bet_amount <= 0:
             return current_prob
         
-        # The marginal probability is simply the new probability after the bet
-        return self.calculate_new_probability(bet_amount, current_prob, outcome)
+        if outcome not in ["YES", "NO"]:
+            raise ValueError(f"Outcome must be 'YES' or 'NO', got {outcome}")
+        
+        if current_prob <= 0 or current_prob >= 1:
+            raise ValueError(f"Probability must be between 0 and 1, got {current_prob}")
+        
+        sign = 1.0 if outcome == "YES" else -1.0
+        return self.calculate_marginal_probability_signed(bet_amount, current_prob, sign)
+    
+    def calculate_marginal_probability_signed(self, bet_amount: float, current_prob: float, sign: float) -> float:
+        """
+        Marginal probability with the outcome given as a sign instead of a string.
+        
+        Uses p' = p / (p + (1 - p) * exp(-sign * bet / b)), which covers both
+        outcomes with the same arithmetic. Inputs are not validated; callers in
+        hot loops compute the sign once and pass it through.
+        
+        Args:
+            bet_amount: Amount of the bet (non-positive amounts leave the price unchanged)
+            current_prob: Current market probability (0 < p < 1)
+            sign: +1.0 for YES, -1.0 for NO
+            
+        Returns:
+            Marginal probability (price at end of bet)
+        """
+        # Clamp the exponent so exp cannot overflow; the price is ~0 there anyway
+        exponent = min(-sign * max(bet_amount, 0.0) / self.b, 700.0)
+        return current_prob / (current_prob + (1 - current_prob) * math.exp(exponent))
     
     def calculate_effective_probability(self, bet_amount: float, current_prob: float, outcome: str) -> float:
         """
@@ -245,6 +350,24 @@ class LMSRCalculator:
         return effective_prob
 
 
+@lru_cache(maxsize=128)
+def get_calculator(liquidity: float) -> LMSRCalculator:
+    """
+    Shared LMSRCalculator for a liquidity level.
+    
+    Markets are re-evaluated with the same liquidity many times per run, so
+    calculators are memoized rather than rebuilt per call. Treat the returned
+    instance as read-only.
+    
+    Args:
+        liquidity: Market liquidity parameter
+        
+    Returns:
+        LMSRCalculator for that liquidity
+    """
+    return LMSRCalculator(liquidity)
+
+
 def calculate_market_impact(bet_amount: float, current_prob: float, liquidity: float, outcome: str) -> float:
     """
     Convenience function to calculate market impact.
@@ -258,8 +381,7 @@ def calculate_market_impact(bet_amount: float, current_prob: float, liquidity: f
     Returns:
         Absolute change in probability
     """
-    calculator = LMSRCalculator(liquidity)
-    return calculator.calculate_market_impact(bet_amount, current_prob, outcome)
+    return get_calculator(liquidity).calculate_market_impact(bet_amount, current_prob, outcome)
 
 
 def find_max_bet_by_impact(current_prob: float, liquidity: float, outcome: str, max_impact: float) -> float:
@@ -275,5 +397,98 @@ def find_max_bet_by_impact(current_prob: float, liquidity: float, outcome: str,
     Returns:
         Maximum bet amount
     """
-    calculator = LMSRCalculator(liquidity)
-    return calculator.find_max_bet_by_impact(current_prob, outcome, max_impact)
+    return get_calculator(liquidity).find_max_bet_by_impact(current_prob, outcome, max_impact)
+
+
+def kelly_bet_with_impact(
+    true_prob: float,
+    market_prob: float,
+    bankroll: float,
+    liquidity: float,
+    kelly_fraction: float,
+    max_prob_impact: float,
+    min_bet: float,
+    max_bet: float
+) -> float:
+    """
+    Fractional Kelly bet sized against the marginal LMSR price, within an impact limit.
+    
+    Solves for the bet whose Kelly size, computed at the price after the bet,
+    matches the bet itself, by bisection. For YES bets the bracket is capped
+    at the impact limit up front and Newton steps (analytic derivative) are
+    taken inside it, falling back to the midpoint when a step leaves the
+    bracket; this typically converges in a handful of iterations.
+    
+    Args:
+        true_prob: Estimated true probability (0 < p < 1)
+        market_prob: Current market probability (0 < p < 1)
+        bankroll: Current bankroll
+        liquidity: Market liquidity parameter (must be positive)
+        kelly_fraction: Fraction of the Kelly bet to use
+        max_prob_impact: Maximum allowed probability change
+        min_bet: Minimum bet amount
+        max_bet: Maximum bet amount
+        
+    Returns:
+        Bet amount, clipped to [min_bet, max_bet]
+    """
+    # Betting YES moves log-odds up by amount / liquidity, NO moves them down
+    direction = 1.0 if true_prob > market_prob else -1.0
+    start_log_odds = math.log2(market_prob / (1 - market_prob)) * _LN2
+    scale = kelly_fraction * bankroll
+    
+    low, high = 0.0, min(bankroll, max_bet)
+    
+    # For YES bets the desired bet falls as the bet grows, so the solution is
+    # unique: cap the bracket at the impact limit (by inverting the LMSR price),
+    # start there, and take Newton steps. NO bets keep plain bisection because
+    # the marginal-price Kelly is not monotone on that side.
+    newton = direction > 0
+    if newton:
+        target_prob = market_prob + max_prob_impact
+        if target_prob < 1:
+            max_by_impact = liquidity * (math.log2(target_prob / (1 - target_prob)) * _LN2 - start_log_odds)
+            high = min(high, max_by_impact)
+        mid = high
+    else:
+        mid = high / 2
+    
+    for _ in range(50):
+        # Marginal probability (price at the end of the bet) and its impact.
+        # exp(-log_odds) is both 1/m - 1 (the Kelly odds) and the term in
+        # m = 1 / (1 + exp(-log_odds)), so one exp serves price, impact and Kelly.
+        log_odds = start_log_odds + direction * mid / liquidity if mid > 0 else start_log_odds
+        if abs(log_odds) < 700:
+            odds = math.exp(-log_odds)
+            marginal_prob = 1 / (1 + odds) if mid > 0 else market_prob
+            edge_fraction = true_prob - (1 - true_prob) / odds
+        else:
+            # Price saturated at 0 or 1: no edge left
+            odds = 0.0
+            marginal_prob = 1.0 if log_odds > 0 else 0.0
+            edge_fraction = 0.0
+        impact = abs(marginal_prob - market_prob)
+        desired_bet = edge_fraction * scale
+        
+        feasible = edge_fraction > 0 and impact <= max_prob_impact * (1 + 1e-9)
+        if not feasible:
+            # No positive edge or impact too high
+            high = mid
+        elif mid == high and mid <= desired_bet:
+            break  # Kelly wants at least the largest allowed bet
+        elif abs(mid - desired_bet) < 0.01:  # Close enough
+            break
+        elif mid < desired_bet:
+            low = mid
+        else:
+            high = mid
+        
+        step = -1.0
+        if newton and feasible:
+            # g(s) = s - desired_bet(s); g'(s) = 1 + scale * (1 - t) * m / ((1 - m) * liquidity),
+            # where m / (1 - m) = 1 / odds
+            slope = 1 + scale * (1 - true_prob) / (odds * liquidity)
+            step = mid - (mid - desired_bet) / slope
+        mid = step if low < step < high else (low + high) / 2
+    
+    return max(min_bet, min(mid, max_bet))
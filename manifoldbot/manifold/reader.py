@@ -5,14 +5,57 @@ No API key required - uses public endpoints only.
 Based on oreacle-bot client patterns with improved pagination handling.
 """
 
+import json
 import logging
+import threading
 import time
-from typing import Any, Dict, List, Optional, Union
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import requests
+from requests.adapters import HTTPAdapter
+
+from .rate_limit import TokenBucket
 
 logger = logging.getLogger(__name__)
 
+# Validators (ETag / Last-Modified) remembered for conditional polling
+MAX_CONDITIONAL_ENTRIES = 128
+
+
+def create_session(
+    pool_connections: int = 20, pool_maxsize: int = 40, adapter: Optional[HTTPAdapter] = None
+) -> requests.Session:
+    """
+    Create a requests session with a keep-alive connection pool.
+
+    Reusing one session across calls avoids a TCP+TLS handshake per request.
+    Retries are handled by ManifoldReader._make_request, not by the adapter.
+
+    Args:
+        pool_connections: Number of host pools to cache
+        pool_maxsize: Maximum connections kept alive per host
+        adapter: Existing adapter to mount instead of a new one, so this session
+            shares another session's open connections but not its headers
+
+    Returns:
+        Configured requests.Session
+    """
+    session = requests.Session()
+    if adapter is None:
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def _retry_after(response: requests.Response) -> float:
+    """Seconds the server asked us to wait (Retry-After header), or 0."""
+    try:
+        return max(0.0, float(response.headers.get("Retry-After", 0)))
+    except (TypeError, ValueError):
+        return 0.0  # HTTP-date form or garbage; fall back to backoff
+
 
 class ManifoldReader:
     """
@@ -24,20 +67,33 @@ class ManifoldReader:
 
     BASE_URL = "https://api.manifold.markets/v0"
 
-    def __init__(self, timeout: int = 30, retry_config: Optional[Dict] = None):
+    def __init__(
+        self,
+        timeout: int = 30,
+        retry_config: Optional[Dict] = None,
+        session: Optional[requests.Session] = None,
+        rate_limit: Optional[TokenBucket] = None,
+    ):
         """
         Initialize ManifoldReader.
 
         Args:
             timeout: Request timeout in seconds
             retry_config: Retry configuration dict
+            session: Optional shared requests.Session (a pooled one is created if omitted)
+            rate_limit: Optional TokenBucket every request (including retries) waits on
         """
         self.timeout = timeout
+        self.rate_limit = rate_limit
         self.retry_config = retry_config or {"max_retries": 3, "backoff_factor": 2, "retry_on": [429, 500, 502, 503, 504]}
 
-        self.session = requests.Session()
+        self.session = session if session is not None else create_session()
         self.session.headers.update({"User-Agent": "ManifoldBot/0.1.0", "Accept": "application/json"})
 
+        # (url, params) -> validator headers, for get_markets_if_changed polling
+        self._validated: "OrderedDict[Tuple[str, str], Dict[str, str]]" = OrderedDict()
+        self._validated_lock = threading.Lock()
+
         logger.info("ManifoldReader initialized (no API key required)")
 
     def _make_request(
@@ -55,20 +111,59 @@ class ManifoldReader:
         Returns:
             JSON response data
 
+        Raises:
+            requests.RequestException: On request failure
+        """
+        return self._request(method, endpoint, params, data)[0]
+
+    def _request(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[Dict] = None,
+        data: Optional[Dict] = None,
+        conditional: bool = False,
+    ) -> Tuple[Any, bool]:
+        """
+        Make HTTP request with retry logic, optionally as a conditional GET.
+
+        With conditional=True, the ETag or Last-Modified header of the previous
+        conditional GET of the same URL and params is sent back (If-None-Match /
+        If-Modified-Since). Only the validators are kept, not the response data.
+
+        Returns:
+            Tuple of (JSON response data, whether it changed since the last request);
+            the data is None when the server replied 304 Not Modified
+
         Raises:
             requests.RequestException: On request failure
         """
         # Build URL like oreacle-bot does
         url = f"{self.BASE_URL}/{endpoint}"
 
+        key = conditional_headers = None
+        if conditional and method == "GET":
+            key = (url, json.dumps(params or {}, sort_keys=True, default=str))
+            with self._validated_lock:
+                conditional_headers = self._validated.get(key)
+
         for attempt in range(self.retry_config["max_retries"] + 1):
+            if self.rate_limit is not None:
+                self.rate_limit.acquire()
             try:
-                response = self.session.request(method=method, url=url, params=params, json=data, timeout=self.timeout)
+                response = self.session.request(
+                    method=method, url=url, params=params, json=data, headers=conditional_headers, timeout=self.timeout
+                )
+
+                if response.status_code == 304 and conditional_headers is not None:
+                    return None, False
 
                 # Check for retryable status codes (don't retry 400 errors - they're client errors)
                 if response.status_code in self.retry_config["retry_on"]:
                     if attempt < self.retry_config["max_retries"]:
-                        wait_time = self.retry_config["backoff_factor"] ** attempt
+                        wait_time = max(
+                            self.retry_config["backoff_factor"] ** attempt, _retry_after(response)
+                        )
                         logger.warning(f"Retrying request after {wait_time}s (status: {response.status_code})")
                         time.sleep(wait_time)
                         continue
@@ -85,7 +180,10 @@ class ManifoldReader:
                     response.raise_for_status()
 
                 response.raise_for_status()
-                return response.json()
+                result = response.json()
+                if key is not None:
+                    self._remember(key, response)
+                return result, True
 
             except requests.RequestException as e:
                 if attempt < self.retry_config["max_retries"]:
@@ -97,7 +195,28 @@ class ManifoldReader:
 
         raise requests.RequestException("Max retries exceeded")
 
-    def _paginate(self, endpoint: str, params: Optional[Dict] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    def _remember(self, key: Tuple[str, str], response: requests.Response) -> None:
+        """Keep a GET response's validators so the next request for it can be conditional."""
+        validators = {}
+        etag = response.headers.get("ETag")
+        if etag:
+            validators["If-None-Match"] = etag
+        last_modified = response.headers.get("Last-Modified")
+        if last_modified:
+            validators["If-Modified-Since"] = last_modified
+
+        with self._validated_lock:
+            if not validators:
+                self._validated.pop(key, None)
+                return
+            self._validated[key] = validators
+            self._validated.move_to_end(key)
+            while len(self._validated) > MAX_CONDITIONAL_ENTRIES:
+                self._validated.popitem(last=False)
+
+    def _paginate(
+        self, endpoint: str, params: Optional[Dict] = None, limit: Optional[int] = None, if_changed: bool = False
+    ) -> Optional[List[Dict[str, Any]]]:
         """
         Handle pagination for list endpoints.
 
@@ -105,15 +224,21 @@ class ManifoldReader:
             endpoint: API endpoint
             params: Query parameters
             limit: Maximum number of items to return (None for all)
+            if_changed: Return None if the first page is unchanged since it was last fetched
 
         Returns:
-            List of all items across all pages
+            List of all items across all pages (or None, see if_changed)
         """
         all_items = []
         page_params = params.copy() if params else {}
 
         while True:
-            response = self._make_request("GET", endpoint, params=page_params)
+            if if_changed and not all_items:
+                response, modified = self._request("GET", endpoint, params=page_params, conditional=True)
+                if not modified:
+                    return None
+            else:
+                response = self._make_request("GET", endpoint, params=page_params)
 
             # Handle different response formats
             if isinstance(response, list):
@@ -201,7 +326,29 @@ class ManifoldReader:
         params = filters or {}
         return self._paginate("markets", params=params, limit=limit)
 
-    def get_all_markets(self, usernames: Optional[Union[str, List[str]]] = None) -> Union[List[Dict[str, Any]], Dict[str, List[Dict[str, Any]]]]:
+    def get_markets_if_changed(
+        self, limit: Optional[int] = None, filters: Optional[Dict[str, Any]] = None
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get markets like get_markets, or None if nothing changed since the last call.
+
+        Polling loops can skip a cycle on None. The first page is requested
+        conditionally (ETag / Last-Modified); a 304 reply costs no body transfer.
+        The first call with given arguments always returns markets.
+
+        Args:
+            limit: Maximum number of markets
+            filters: Filter parameters (creator, category, etc.)
+
+        Returns:
+            List of markets, or None if unchanged
+        """
+        params = filters or {}
+        return self._paginate("markets", params=params, limit=limit, if_changed=True)
+
+    def get_all_markets(
+        self, usernames: Optional[Union[str, List[str]]] = None, limit: Optional[int] = None
+    ) -> Union[List[Dict[str, Any]], Dict[str, List[Dict[str, Any]]]]:
         """
         Get ALL markets by specific user(s).
         
@@ -211,6 +358,8 @@ class ManifoldReader:
         Args:
             usernames: Username(s) to filter by. Can be a single string or list of strings.
                       Defaults to "MikhailTal" if not provided
+            limit: Maximum number of (most recent) markets per user. Paging stops
+                   as soon as every user has this many, instead of fetching all markets.
             
         Returns:
             If single username: List of ALL markets created by the specified user
@@ -231,12 +380,14 @@ class ManifoldReader:
         # Get all markets using proper pagination with 'before' parameter
         all_markets = []
         page = 1
-        limit = 1000
+        page_size = 1000
         before_cursor = None
+        by_username = {username: 0 for username in usernames}
+        by_name = {username: 0 for username in usernames}
         
         while True:
             # Build params for this page
-            params = {"limit": limit}
+            params = {"limit": page_size}
             if before_cursor:
                 params["before"] = before_cursor
             
@@ -259,8 +410,22 @@ class ManifoldReader:
             if page % 10 == 0:
                 print(f"  Fetched {len(all_markets)} markets so far...")
             
-            # If we got fewer than the limit, we've reached the end
-            if len(markets) < limit:
+            # Markets come newest first, so stop once every user has enough.
+            # Count the way the filter below picks: usernames first, then
+            # display names only for users with no username matches.
+            if limit:
+                for m in markets:
+                    if m.get('creatorUsername') in by_username:
+                        by_username[m['creatorUsername']] += 1
+                    if m.get('creatorName') in by_name:
+                        by_name[m['creatorName']] += 1
+                if all(
+                    (by_username[u] or by_name[u]) >= limit for u in usernames
+                ):
+                    break
+            
+            # If we got fewer than the page size, we've reached the end
+            if len(markets) < page_size:
                 break
                 
             # Use the last market's ID as the cursor for next request
@@ -287,6 +452,9 @@ class ManifoldReader:
                     if m.get('creatorName') == username
                 ]
             
+            if limit:
+                markets = markets[:limit]
+            
             user_markets[username] = markets
             print(f"✅ Found {len(markets)} markets by {username}")
         
@@ -10,6 +10,7 @@ from typing import Any, Dict, List, Optional
 
 import requests
 
+from .rate_limit import TokenBucket
 from .reader import ManifoldReader
 from .comments import Comment, CommentReply
 
@@ -28,7 +29,14 @@ class ManifoldWriter(ManifoldReader):
     Requires a Manifold API key for authentication.
     """
 
-    def __init__(self, api_key: str, timeout: int = 30, retry_config: Optional[Dict[str, Any]] = None):
+    def __init__(
+        self,
+        api_key: str,
+        timeout: int = 30,
+        retry_config: Optional[Dict[str, Any]] = None,
+        session: Optional[requests.Session] = None,
+        rate_limit: Optional[TokenBucket] = None,
+    ):
         """
         Initialize ManifoldWriter with API key.
 
@@ -36,8 +44,10 @@ class ManifoldWriter(ManifoldReader):
             api_key: Manifold Markets API key
             timeout: Request timeout in seconds
             retry_config: Custom retry configuration
+            session: Optional shared requests.Session (a pooled one is created if omitted)
+            rate_limit: Optional TokenBucket every request (including retries) waits on
         """
-        super().__init__(timeout=timeout, retry_config=retry_config)
+        super().__init__(timeout=timeout, retry_config=retry_config, session=session, rate_limit=rate_limit)
 
         self.api_key = api_key
         self.logger = logging.getLogger(__name__)
@@ -46,6 +46,7 @@ setup(
             "pytest>=7.0.0",
             "pytest-cov>=4.0.0",
             "pytest-mock>=3.10.0",
+            "pytest-xdist>=3.0.0",
         ],
         "dev": [
             "black>=22.0.0",
@@ -0,0 +1 @@
+"""Tests for ManifoldBot ai module."""
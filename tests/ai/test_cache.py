@@ -0,0 +1,108 @@
+"""
+Tests for the LLM response cache.
+"""
+
+from unittest.mock import patch
+
+from manifoldbot.ai.cache import LLMCache, SemanticCache
+
+
+class TestLLMCache:
+    """Test cases for LLMCache."""
+
+    def test_make_key_is_order_independent(self):
+        """Test that keys depend on content, not dict ordering."""
+        key1 = LLMCache.make_key({"model": "gpt-4", "messages": [{"role": "user", "content": "hi"}]})
+        key2 = LLMCache.make_key({"messages": [{"role": "user", "content": "hi"}], "model": "gpt-4"})
+        key3 = LLMCache.make_key({"model": "gpt-4o", "messages": [{"role": "user", "content": "hi"}]})
+
+        assert key1 == key2
+        assert key1 != key3
+
+    def test_memory_get_set(self):
+        """Test in-memory round trip."""
+        cache = LLMCache()
+        cache.set("k", {"llm_probability": 0.4})
+
+        assert cache.get("k") == {"llm_probability": 0.4}
+        assert cache.get("missing") is None
+
+    def test_expiry(self):
+        """Test that entries expire after the TTL."""
+        cache = LLMCache(ttl=10)
+        with patch("manifoldbot.ai.cache.time.time", return_value=1000.0):
+            cache.set("k", {"x": 1})
+        with patch("manifoldbot.ai.cache.time.time", return_value=1011.0):
+            assert cache.get("k") is None
+
+    def test_memory_is_bounded(self):
+        """Test that the least recently used entry is evicted beyond max_entries."""
+        cache = LLMCache(max_entries=2)
+        cache.set("a", {"x": 1})
+        cache.set("b", {"x": 2})
+        cache.get("a")
+        cache.set("c", {"x": 3})
+
+        assert cache.get("a") == {"x": 1}
+        assert cache.get("b") is None
+        assert cache.get("c") == {"x": 3}
+
+    def test_persistence(self, tmp_path):
+        """Test that a SQLite-backed cache survives a new instance."""
+        path = str(tmp_path / "cache" / "llm.sqlite")
+        LLMCache(path=path).set("k", {"reasoning": "persisted"})
+
+        assert LLMCache(path=path).get("k") == {"reasoning": "persisted"}
+
+    def test_clear(self, tmp_path):
+        """Test that clear empties memory and disk."""
+        path = str(tmp_path / "llm.sqlite")
+        cache = LLMCache(path=path)
+        cache.set("k", {"x": 1})
+        cache.clear()
+
+        assert cache.get("k") is None
+        assert LLMCache(path=path).get("k") is None
+
+
+class TestSemanticCache:
+    """Test cases for SemanticCache."""
+
+    def test_similar_embedding_hits(self):
+        """Test that a nearby embedding returns the stored value."""
+        cache = SemanticCache(threshold=0.95)
+        cache.set([1.0, 0.0, 0.0], {"llm_probability": 0.7})
+
+        assert cache.get([0.99, 0.05, 0.0]) == {"llm_probability": 0.7}
+        assert cache.get([0.0, 1.0, 0.0]) is None
+
+    def test_returns_most_similar(self):
+        """Test that the closest match wins when several pass the threshold."""
+        cache = SemanticCache(threshold=0.9)
+        cache.set([1.0, 0.2], {"llm_probability": 0.3})
+        cache.set([1.0, 0.0], {"llm_probability": 0.6})
+
+        assert cache.get([2.0, 0.0]) == {"llm_probability": 0.6}
+
+    def test_max_entries(self):
+        """Test that the oldest entries are evicted."""
+        cache = SemanticCache(max_entries=1)
+        cache.set([1.0, 0.0], {"llm_probability": 0.3})
+        cache.set([0.0, 1.0], {"llm_probability": 0.6})
+
+        assert cache.get([1.0, 0.0]) is None
+        assert cache.get([0.0, 1.0]) == {"llm_probability": 0.6}
+
+    def test_persistence(self, tmp_path):
+        """Test that entries survive a new instance, up to max_entries, per embedding model."""
+        path = str(tmp_path / "semantic.sqlite")
+        cache = SemanticCache(path=path, max_entries=2)
+        for i in range(3):
+            cache.set([1.0, float(i)], {"llm_probability": i / 10})
+
+        reloaded = SemanticCache(path=path, max_entries=2)
+        other_model = SemanticCache(path=path, model="other-embedding")
+
+        assert reloaded.get([1.0, 0.0]) is None
+        assert reloaded.get([1.0, 2.0]) == {"llm_probability": 0.2}
+        assert other_model.get([1.0, 2.0]) is None
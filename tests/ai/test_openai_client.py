@@ -0,0 +1,359 @@
+"""
+Tests for the OpenAI market analysis helpers.
+"""
+
+import asyncio
+import json
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from manifoldbot.ai.cache import LLMCache, SemanticCache
+from manifoldbot.ai.openai_client import (
+    _build_request, _parse_response, _read_stream, _read_stream_async, analyze_market_with_gpt,
+    analyze_markets_with_batch_api, analyze_markets_with_gpt
+)
+
+
+def make_chunks(*deltas):
+    """Build fake streamed completion chunks."""
+    return [SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=d))]) for d in deltas]
+
+
+def make_completion(content):
+    """Build a fake chat completion."""
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+class TestParseResponse:
+    """Test cases for _parse_response."""
+
+    def test_parses_all_fields(self):
+        """Test the standard response format."""
+        result = _parse_response(
+            "PROBABILITY: 65%\nCONFIDENCE: 80%\nREASONING: Strong evidence: polls agree",
+            "gpt-4"
+        )
+
+        assert result["llm_probability"] == 0.65
+        assert result["confidence"] == 0.8
+        assert result["reasoning"] == "Strong evidence: polls agree"
+        assert result["model_used"] == "gpt-4"
+        assert result["success"] is True
+
+    def test_tolerates_whitespace_and_case(self):
+        """Test that preamble, blank lines, case and spacing don't break parsing."""
+        result = _parse_response(
+            "Here is my analysis.\n\n  Probability : 12.5 %\n\nconfidence:70\nREASONING:  Unclear  ",
+            "gpt-4"
+        )
+
+        assert result["llm_probability"] == 0.125
+        assert result["confidence"] == 0.7
+        assert result["reasoning"] == "Unclear"
+
+    def test_defaults_for_missing_or_invalid_values(self):
+        """Test fallback values when fields are absent or not numeric."""
+        result = _parse_response("PROBABILITY: unknown\nCONFIDENCE:\n", "gpt-4")
+
+        assert result["llm_probability"] == 0.5
+        assert result["confidence"] == 0.5
+        assert result["reasoning"] == "No reasoning provided"
+
+    def test_last_occurrence_wins(self):
+        """Test that a repeated field takes its final value."""
+        result = _parse_response("PROBABILITY: 30%\nPROBABILITY: 35%\nCONFIDENCE: 60%", "gpt-4")
+
+        assert result["llm_probability"] == 0.35
+        assert result["confidence"] == 0.6
+
+
+class TestBuildRequest:
+    """Test cases for _build_request."""
+
+    def test_market_fields_come_last(self):
+        """Test that prompts share a constant prefix and end with the market's own fields."""
+        prompt = _build_request("Will {x} win?", "50% {}", 0.123, "gpt-4")["messages"][1]["content"]
+        other = _build_request("Other?", "", 0.5, "gpt-4")["messages"][1]["content"]
+
+        prefix = prompt[:prompt.index("Question: ")]
+        assert other.startswith(prefix)
+        assert prompt.endswith("Question: Will {x} win?\nDescription: 50% {}\nCurrent market probability: 12.3%\n")
+
+
+class TestReadStream:
+    """Test cases for streamed responses."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.chunks = make_chunks(
+            "PROBABILITY: 6", "5%\nCONFIDENCE: 80%\n", None, "REASONING: Polls", " agree\n", "Extra text", "\n"
+        )
+
+    def test_stops_after_reasoning_line(self):
+        """Test that reading stops once the REASONING line is complete."""
+        stream = MagicMock()
+        stream.__iter__.return_value = iter(self.chunks)
+
+        text = _read_stream(stream)
+
+        assert text == "PROBABILITY: 65%\nCONFIDENCE: 80%\nREASONING: Polls agree"
+        assert _parse_response(text, "gpt-4")["reasoning"] == "Polls agree"
+        stream.close.assert_called_once()
+
+    def test_stops_after_answer_lines(self):
+        """Test that reading can stop as soon as PROBABILITY and CONFIDENCE are complete."""
+        stream = MagicMock()
+        stream.__iter__.return_value = iter(self.chunks)
+
+        text = _read_stream(stream, stop_after=("PROBABILITY", "CONFIDENCE"))
+
+        assert text == "PROBABILITY: 65%\nCONFIDENCE: 80%"
+        stream.close.assert_called_once()
+
+    def test_async_stops_after_reasoning_line(self):
+        """Test the async reader stops at the same point."""
+        chunks = self.chunks
+        closed = []
+
+        class FakeAsyncStream:
+            async def __aiter__(self):
+                for chunk in chunks:
+                    yield chunk
+
+            async def close(self):
+                closed.append(True)
+
+        text = asyncio.run(_read_stream_async(FakeAsyncStream()))
+
+        assert text.endswith("REASONING: Polls agree")
+        assert closed == [True]
+
+
+class TestAnalyzeMarketWithGpt:
+    """Test cases for single-market analysis."""
+
+    @patch("openai.OpenAI")
+    def test_empty_reply_is_an_error(self, mock_openai):
+        """Test that empty or answer-less replies fail without being cached."""
+        create = mock_openai.return_value.chat.completions.create
+        cache = LLMCache()
+
+        results = []
+        for content in (None, "   ", "I cannot help with that.", "PROBABILITY: 40%"):
+            create.return_value = make_completion(content)
+            results.append(analyze_market_with_gpt("Q?", "", 0.5, model="gpt-4", api_key="test_key", cache=cache))
+
+        # Only the final, well-formed reply succeeds; the earlier ones weren't cached
+        assert [r["success"] for r in results] == [False, False, False, True]
+        assert results[0]["confidence"] == 0.0
+        assert "cached" not in results[-1]
+
+    @patch("openai.OpenAI")
+    def test_json_mode(self, mock_openai):
+        """Test that json_mode requests a JSON object and parses it, falling back to lines."""
+        create = mock_openai.return_value.chat.completions.create
+        create.return_value = make_completion('{"probability": 65, "confidence": "80%", "reasoning": "Polls agree"}')
+
+        result = analyze_market_with_gpt("Q?", "", 0.5, model="gpt-4", api_key="test_key", json_mode=True)
+
+        assert (result["llm_probability"], result["confidence"], result["reasoning"]) == (0.65, 0.8, "Polls agree")
+        assert create.call_args[1]["response_format"] == {"type": "json_object"}
+
+        create.return_value = make_completion("PROBABILITY: 40%\nCONFIDENCE: 50%\nREASONING: Lines")
+        result = analyze_market_with_gpt("Q2?", "", 0.5, model="gpt-4", api_key="test_key", json_mode=True)
+
+        assert result["llm_probability"] == 0.4
+
+    @patch("openai.OpenAI")
+    def test_json_mode_fractions(self, mock_openai):
+        """Test that only values strictly between 0 and 1 are read as fractions; whole numbers are percentages."""
+        create = mock_openai.return_value.chat.completions.create
+        answers = {
+            '0.65': 0.65, '"0.65"': 0.65, '1': 0.01, '1.0': 0.01, '"1"': 0.01, '"1%"': 0.01, '65': 0.65, '0': 0.0,
+        }
+
+        for raw, expected in answers.items():
+            create.return_value = make_completion(f'{{"probability": {raw}, "confidence": 80, "reasoning": "ok"}}')
+            result = analyze_market_with_gpt(f"Q{raw}?", "", 0.5, model="gpt-4", api_key="test_key", json_mode=True)
+
+            assert result["llm_probability"] == pytest.approx(expected), raw
+
+    @patch("openai.OpenAI")
+    def test_skip_reasoning_is_cached_separately(self, mock_openai):
+        """Test that reasoning-less streamed results don't answer full requests from the cache."""
+        create = mock_openai.return_value.chat.completions.create
+        chunks = make_chunks("PROBABILITY: 65%\n", "CONFIDENCE: 80%\n", "REASONING: Polls\n")
+        create.side_effect = lambda **kwargs: MagicMock(__iter__=lambda self: iter(chunks))
+        cache = LLMCache()
+
+        fast = analyze_market_with_gpt(
+            "Q?", "", 0.5, model="gpt-4", api_key="test_key", cache=cache, stream=True, skip_reasoning=True
+        )
+        full = analyze_market_with_gpt("Q?", "", 0.5, model="gpt-4", api_key="test_key", cache=cache, stream=True)
+
+        assert fast["llm_probability"] == 0.65 and fast["reasoning"] == "No reasoning provided"
+        assert full["reasoning"] == "Polls"
+        assert create.call_count == 2
+
+
+class TestAnalyzeMarketsWithGpt:
+    """Test cases for batched market analysis."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.markets = [
+            {"question": f"Q{i}?", "description": "", "current_probability": 0.5}
+            for i in range(1, 4)
+        ]
+
+    @patch("openai.OpenAI")
+    def test_one_request_per_batch(self, mock_openai):
+        """Test that markets share a request and missing entries fall back to single calls."""
+        create = mock_openai.return_value.chat.completions.create
+        create.side_effect = [
+            make_completion(json.dumps({"results": [
+                {"i": 2, "probability": 70, "confidence": "80%", "reasoning": "Second"},
+                {"i": 1, "probability": 20, "confidence": 60, "reasoning": "First"},
+            ]})),
+            make_completion("PROBABILITY: 40%\nCONFIDENCE: 50%\nREASONING: Third"),
+        ]
+
+        results = analyze_markets_with_gpt(self.markets, model="gpt-4", api_key="test_key")
+
+        assert [r["reasoning"] for r in results] == ["First", "Second", "Third"]
+        assert [r["llm_probability"] for r in results] == [0.2, 0.7, 0.4]
+        assert results[1]["confidence"] == 0.8
+        assert create.call_count == 2
+        assert create.call_args_list[0][1]["response_format"] == {"type": "json_object"}
+        assert "3. Question: Q3?" in create.call_args_list[0][1]["messages"][1]["content"]
+
+    @patch("openai.OpenAI")
+    def test_entry_without_probability_falls_back(self, mock_openai):
+        """Test that a batch entry with no probability is retried on its own, not read as 50/50."""
+        create = mock_openai.return_value.chat.completions.create
+        create.side_effect = [
+            make_completion(json.dumps({"results": [
+                {"i": 1, "probability": 20, "confidence": 60, "reasoning": "First"},
+                {"i": 2},
+                {"i": 3, "probability": 30, "confidence": 60, "reasoning": "Third"},
+            ]})),
+            make_completion("PROBABILITY: 70%\nCONFIDENCE: 80%\nREASONING: Second"),
+        ]
+
+        results = analyze_markets_with_gpt(self.markets, model="gpt-4", api_key="test_key")
+
+        assert [r["llm_probability"] for r in results] == [0.2, 0.7, 0.3]
+        assert results[1]["reasoning"] == "Second"
+        assert create.call_count == 2
+
+    @patch("openai.OpenAI")
+    def test_invalid_json_falls_back(self, mock_openai):
+        """Test that an unparseable batch reply falls back to per-market requests."""
+        create = mock_openai.return_value.chat.completions.create
+        create.side_effect = [make_completion("not json")] + [
+            make_completion(f"PROBABILITY: {p}%\nCONFIDENCE: 50%\nREASONING: ok") for p in (10, 20, 30)
+        ]
+
+        results = analyze_markets_with_gpt(self.markets, model="gpt-4", api_key="test_key")
+
+        assert [r["llm_probability"] for r in results] == [0.1, 0.2, 0.3]
+        assert create.call_count == 4
+
+    @patch("openai.OpenAI")
+    def test_cached_markets_skip_the_batch(self, mock_openai):
+        """Test that batch results are cached under the single-market key."""
+        create = mock_openai.return_value.chat.completions.create
+        create.return_value = make_completion(json.dumps({"results": [
+            {"i": i, "probability": 50, "confidence": 50, "reasoning": "ok"} for i in (1, 2, 3)
+        ]}))
+        cache = LLMCache()
+
+        analyze_markets_with_gpt(self.markets, model="gpt-4", api_key="test_key", cache=cache)
+        results = analyze_markets_with_gpt(self.markets, model="gpt-4", api_key="test_key", cache=cache)
+
+        assert all(r["cached"] for r in results)
+        assert create.call_count == 1
+
+    @patch("openai.OpenAI")
+    def test_semantic_cache_embeds_batch_once(self, mock_openai):
+        """Test that near-duplicates are answered from one embeddings call and the rest are stored."""
+        client = mock_openai.return_value
+        client.embeddings.create.return_value = SimpleNamespace(data=[
+            SimpleNamespace(index=i, embedding=vector) for i, vector in enumerate([[1, 0], [0, 1], [1, 1]])
+        ])
+        client.chat.completions.create.return_value = make_completion(json.dumps({"results": [
+            {"i": i, "probability": 40, "confidence": 50, "reasoning": "New"} for i in (1, 2)
+        ]}))
+        semantic_cache = SemanticCache()
+        semantic_cache.set([1, 0.01], {"llm_probability": 0.9, "reasoning": "Seen"})
+
+        results = analyze_markets_with_gpt(
+            self.markets, model="gpt-4", api_key="test_key", semantic_cache=semantic_cache
+        )
+
+        assert [r["reasoning"] for r in results] == ["Seen", "New", "New"]
+        assert results[0]["cached"] is True
+        assert client.embeddings.create.call_args[1]["input"] == ["Q1?", "Q2?", "Q3?"]
+        assert "1. Question: Q2?" in client.chat.completions.create.call_args[1]["messages"][1]["content"]
+        assert semantic_cache.get([0, 1])["reasoning"] == "New"
+
+
+class TestAnalyzeMarketsWithBatchApi:
+    """Test cases for Batch API market analysis."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.markets = [
+            {"question": f"Q{i}?", "description": "", "current_probability": 0.5}
+            for i in range(1, 4)
+        ]
+
+    def output_line(self, custom_id, content):
+        """Build one line of a batch output file."""
+        return json.dumps({
+            "custom_id": custom_id,
+            "response": {"body": {"choices": [{"message": {"content": content}}]}}
+        })
+
+    @patch("openai.OpenAI")
+    def test_submits_one_job_and_maps_results(self, mock_openai):
+        """Test that uncached markets go into one job and results come back in order."""
+        client = mock_openai.return_value
+        client.files.create.return_value = SimpleNamespace(id="file-in")
+        client.batches.create.return_value = SimpleNamespace(id="batch-1", status="validating")
+        client.batches.retrieve.return_value = SimpleNamespace(
+            id="batch-1", status="completed", output_file_id="file-out"
+        )
+        client.files.content.return_value = SimpleNamespace(text="\n".join([
+            self.output_line("2", "PROBABILITY: 30%\nCONFIDENCE: 70%\nREASONING: Third"),
+            self.output_line("0", "PROBABILITY: 10%\nCONFIDENCE: 70%\nREASONING: First"),
+        ]))
+        cache = LLMCache()
+        cache.set(LLMCache.make_key(_build_request("Q2?", "", 0.5, "gpt-4")), {"llm_probability": 0.2})
+
+        results = analyze_markets_with_batch_api(
+            self.markets, model="gpt-4", api_key="test_key", cache=cache, poll_interval=0
+        )
+
+        assert [r["llm_probability"] for r in results] == [0.1, 0.2, 0.3]
+        assert results[1]["cached"] is True
+        upload = client.files.create.call_args[1]
+        assert upload["purpose"] == "batch"
+        lines = [json.loads(line) for line in upload["file"][1].decode("utf-8").splitlines()]
+        assert [line["custom_id"] for line in lines] == ["0", "2"]
+        assert lines[0]["body"] == _build_request("Q1?", "", 0.5, "gpt-4")
+        client.batches.create.assert_called_once()
+
+    @patch("openai.OpenAI")
+    def test_failed_job_returns_errors(self, mock_openai):
+        """Test that a failed job yields error results instead of synchronous retries."""
+        client = mock_openai.return_value
+        client.files.create.return_value = SimpleNamespace(id="file-in")
+        client.batches.create.return_value = SimpleNamespace(id="batch-1", status="failed", output_file_id=None)
+
+        results = analyze_markets_with_batch_api(self.markets, model="gpt-4", api_key="test_key", poll_interval=0)
+
+        assert [r["success"] for r in results] == [False, False, False]
+        client.chat.completions.create.assert_not_called()
@@ -0,0 +1,64 @@
+"""
+Shared pytest configuration.
+
+Tests marked ``integration`` call the real Manifold (and OpenAI) APIs. They
+are skipped unless pytest is run with ``--run-integration``, so the default
+run makes no network requests.
+
+The cached OpenAI client is dropped after every test, so a client built
+from one test's patched ``openai.OpenAI`` never leaks into the next.
+"""
+
+import importlib
+
+import pytest
+
+from manifoldbot.ai.openai_client import _get_client
+
+EXAMPLE_MODULES = {
+    "llm_trading_bot": "manifoldbot.examples.bot.llm_trading_bot",
+    "ai_optimist_trading_bot": "manifoldbot.examples.bot.ai_optimist_trading_bot",
+    "basic_reader": "manifoldbot.examples.manifold.basic_reader",
+    "basic_writer": "manifoldbot.examples.manifold.basic_writer",
+    "bet_sizing_example": "manifoldbot.examples.betsizing.bet_sizing_example",
+}
+
+
+def pytest_addoption(parser):
+    """Add the --run-integration option."""
+    parser.addoption(
+        "--run-integration",
+        action="store_true",
+        default=False,
+        help="run tests marked integration (require network access)",
+    )
+
+
+def pytest_configure(config):
+    """Register the integration marker (pytest.ini's [tool:pytest] section isn't read)."""
+    config.addinivalue_line("markers", "integration: marks tests as integration tests (requires network)")
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip integration tests unless --run-integration was given."""
+    if config.getoption("--run-integration"):
+        return
+
+    skip_integration = pytest.mark.skip(reason="integration test (use --run-integration)")
+    for item in items:
+        if "integration" in item.keywords:
+            item.add_marker(skip_integration)
+
+
+@pytest.fixture(scope="session")
+def example_modules():
+    """Example modules keyed by short name, imported once per session."""
+    return {name: importlib.import_module(path) for name, path in EXAMPLE_MODULES.items()}
+
+
+@pytest.fixture(autouse=True)
+def _clear_openai_client():
+    """Forget cached OpenAI clients, which may wrap another test's mock."""
+    _get_client.cache_clear()
+    yield
+    _get_client.cache_clear()
@@ -5,10 +5,15 @@ Tests for the generic ManifoldBot framework.
 import pytest
 import os
 import platform
+from types import SimpleNamespace
+from unittest.mock import MagicMock, Mock, patch
 from manifoldbot.manifold.bot import (
     ManifoldBot, DecisionMaker, MarketDecision, TradingSession,
-    CallbackDecisionMaker, RandomDecisionMaker
+    CallbackDecisionMaker, RandomDecisionMaker, LLMDecisionMaker
 )
+from manifoldbot.manifold.writer import ManifoldWriter
+from manifoldbot.manifold.rate_limit import TokenBucket
+from manifoldbot.ai.cache import SemanticCache
 
 
 class MockDecisionMaker(DecisionMaker):
@@ -33,12 +38,17 @@ class MockDecisionMaker(DecisionMaker):
 
 
 # Skip integration tests on non-macOS systems (like GitHub CI)
-skip_if_not_darwin = pytest.mark.skipif(
+_not_darwin = pytest.mark.skipif(
     platform.system() != "Darwin" or os.getenv("CI") == "true",
     reason="Integration tests only run locally on macOS"
 )
 
 
+def skip_if_not_darwin(test):
+    """Mark a real-API test as integration (see --run-integration) and macOS-only."""
+    return pytest.mark.integration(_not_darwin(test))
+
+
 class TestManifoldBot:
     """Test cases for ManifoldBot."""
     
@@ -235,4 +245,429 @@ class TestCallbackDecisionMaker:
         assert decision.decision == "YES"
         assert decision.confidence == 0.8
         assert decision.reasoning == "Callback decision"
-        assert decision.market_id == "test"
\ No newline at end of file
+        assert decision.market_id == "test"
+
+class TestRunOnMarkets:
+    """Test cases for ManifoldBot.run_on_markets with mocked API calls."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.markets = [{"id": f"m{i}", "question": f"Market {i}?", "probability": 0.5} for i in range(5)]
+    
+    def _make_bot(self, decision_maker):
+        with patch.object(ManifoldWriter, "get_me", return_value={"balance": 100.0}):
+            return ManifoldBot(manifold_api_key="test_key", decision_maker=decision_maker)
+    
+    def test_reader_shares_writer_connection_pool(self):
+        """Test that the bot's reader reuses the writer's connections but not its credentials."""
+        bot = self._make_bot(MockDecisionMaker())
+        url = bot.reader.BASE_URL
+        
+        assert bot.reader.session is not bot.writer.session
+        assert bot.reader.session.get_adapter(url) is bot.writer.session.get_adapter(url)
+        assert "Authorization" not in bot.reader.session.headers
+        assert bot.writer.session.headers["Authorization"] == "Key test_key"
+    
+    def test_run_on_markets_batches(self):
+        """Test that every market is analyzed once, in order, across batches."""
+        decision_maker = MockDecisionMaker()
+        bot = self._make_bot(decision_maker)
+        
+        with patch.object(decision_maker, "analyze_markets", wraps=decision_maker.analyze_markets) as mock_batch, \
+             patch.object(ManifoldWriter, "get_me", return_value={"balance": 100.0}):
+            session = bot.run_on_markets(self.markets, max_bets=5, batch_size=2)
+        
+        assert mock_batch.call_count == 3
+        assert session.markets_analyzed == 5
+        assert [d.market_id for d in session.decisions] == ["m0", "m1", "m2", "m3", "m4"]
+        assert session.bets_placed == 0
+    
+    def test_run_on_markets_stops_at_max_bets(self):
+        """Test that batches shrink to the remaining bets, so nothing is analyzed past max_bets."""
+        decision_maker = MockDecisionMaker(decision="YES", outcome_type="BINARY")
+        bot = self._make_bot(decision_maker)
+        markets = [dict(market, creatorUsername="MikhailTal") for market in self.markets]
+        writer_mocks = {"get_me": MagicMock(return_value={"balance": 100.0}), "place_bet": MagicMock(return_value={})}
+        
+        with patch.object(decision_maker, "analyze_markets", wraps=decision_maker.analyze_markets) as mock_batch, \
+             patch.multiple(ManifoldWriter, **writer_mocks):
+            session = bot.run_on_markets(markets, max_bets=3, batch_size=2, delay_between_bets=0)
+        
+        assert [[m["id"] for m in call[0][0]] for call in mock_batch.call_args_list] == [["m0", "m1"], ["m2"]]
+        assert session.bets_placed == 3
+        assert session.markets_analyzed == 3
+    
+    def test_batch_api_scan_is_one_job(self):
+        """Test that a Batch API decision maker gets every market in one call, forwarded from run_on_user_markets."""
+        decision_maker = MockDecisionMaker(decision="YES", outcome_type="BINARY")
+        decision_maker.use_batch_api = True
+        bot = self._make_bot(decision_maker)
+        markets = [dict(market, creatorUsername="MikhailTal") for market in self.markets]
+        writer_mocks = {"get_me": MagicMock(return_value={"balance": 100.0}), "place_bet": MagicMock(return_value={})}
+        
+        with patch.object(decision_maker, "analyze_markets", wraps=decision_maker.analyze_markets) as mock_batch, \
+             patch.multiple(ManifoldWriter, **writer_mocks), \
+             patch.object(bot.reader, "get_all_markets", return_value=markets):
+            session = bot.run_on_user_markets("MikhailTal", limit=0, max_bets=2, delay_between_bets=0, batch_size=50)
+        
+        assert mock_batch.call_count == 1
+        assert len(mock_batch.call_args[0][0]) == 5
+        assert session.bets_placed == 2
+        assert session.markets_analyzed == 2
+    
+    def test_run_on_markets_batch_failure_falls_back(self):
+        """Test that a failing batch is retried market by market."""
+        decision_maker = MockDecisionMaker()
+        bot = self._make_bot(decision_maker)
+        
+        with patch.object(MockDecisionMaker, "analyze_markets", side_effect=RuntimeError("boom")), \
+             patch.object(ManifoldWriter, "get_me", return_value={"balance": 100.0}):
+            session = bot.run_on_markets(self.markets, max_bets=1, batch_size=5)
+        
+        assert session.markets_analyzed == 5
+        assert session.errors == []
+    
+    def test_run_on_markets_tracks_balance_locally(self):
+        """Test that bets draw down a local balance instead of re-fetching it per bet."""
+        bot = self._make_bot(MockDecisionMaker(decision="YES", outcome_type="BINARY"))
+        markets = [dict(market, creatorUsername="MikhailTal") for market in self.markets]
+        mock_get_me = MagicMock(return_value={"balance": 25.0})
+        mock_place_bet = MagicMock(return_value={})
+        
+        with patch.multiple(ManifoldWriter, get_me=mock_get_me, place_bet=mock_place_bet), \
+             patch.object(bot.reader, "get_market") as mock_get_market:
+            session = bot.run_on_markets(markets, bet_amount=10, max_bets=5, delay_between_bets=0)
+        
+        # 25 M$ covers two 10 M$ bets; the third is refused without asking the API
+        assert mock_place_bet.call_count == 2
+        assert session.bets_placed == 2
+        assert mock_get_me.call_count == 2  # start and end of session
+        assert bot._balance is None
+        # The markets being analyzed are reused for the tradeability checks
+        mock_get_market.assert_not_called()
+    
+    def test_run_on_markets_waits_on_shared_bet_limiter(self):
+        """Test that bets acquire from a shared token bucket rather than sleeping after each one."""
+        bucket = TokenBucket(rate=1.0, capacity=1)
+        with patch.object(ManifoldWriter, "get_me", return_value={"balance": 100.0}):
+            bot = ManifoldBot(
+                manifold_api_key="test_key",
+                decision_maker=MockDecisionMaker(decision="YES", outcome_type="BINARY"),
+                bet_rate_limit=bucket
+            )
+        
+        writer_mocks = {"get_me": MagicMock(return_value={"balance": 100.0}), "place_bet": MagicMock(return_value={})}
+        with patch.multiple(ManifoldWriter, **writer_mocks), \
+             patch.object(bucket, "acquire", wraps=bucket.try_acquire) as mock_acquire, \
+             patch("time.sleep") as mock_sleep:
+            session = bot.run_on_markets(
+                [dict(market, creatorUsername="MikhailTal") for market in self.markets], bet_amount=10, max_bets=3
+            )
+        
+        assert session.bets_placed == 3
+        assert mock_acquire.call_count == 3
+        mock_sleep.assert_not_called()
+        assert bot._bet_limiter is None
+    
+    def test_run_on_markets_prefilters(self):
+        """Test that untradeable, non-binary and low-volume markets never reach the decision maker."""
+        decision_maker = MockDecisionMaker()
+        with patch.object(ManifoldWriter, "get_me", return_value={"balance": 100.0}):
+            bot = ManifoldBot(manifold_api_key="test_key", decision_maker=decision_maker, min_volume=50)
+        markets = [
+            {"id": "ok", "outcomeType": "BINARY", "volume": 100},
+            {"id": "resolved", "outcomeType": "BINARY", "volume": 100, "isResolved": True},
+            {"id": "closed", "outcomeType": "BINARY", "volume": 100, "closeTime": 1},
+            {"id": "multi", "outcomeType": "MULTIPLE_CHOICE", "volume": 100},
+            {"id": "thin", "outcomeType": "BINARY", "volume": 10},
+        ]
+        
+        with patch.object(decision_maker, "analyze_markets", wraps=decision_maker.analyze_markets) as mock_batch, \
+             patch.object(ManifoldWriter, "get_me", return_value={"balance": 100.0}):
+            session = bot.run_on_markets(markets, max_bets=1)
+        
+        assert [m["id"] for m in mock_batch.call_args[0][0]] == ["ok"]
+        assert session.markets_analyzed == 1
+    
+    def test_run_on_markets_deduplicates(self):
+        """Test that a market listed twice, e.g. from overlapping feeds, is analyzed once."""
+        decision_maker = MockDecisionMaker()
+        bot = self._make_bot(decision_maker)
+        
+        with patch.object(decision_maker, "analyze_markets", wraps=decision_maker.analyze_markets) as mock_batch, \
+             patch.object(ManifoldWriter, "get_me", return_value={"balance": 100.0}):
+            session = bot.run_on_markets(self.markets[:3] + self.markets[1:], max_bets=5)
+        
+        assert [m["id"] for m in mock_batch.call_args[0][0]] == ["m0", "m1", "m2", "m3", "m4"]
+        assert session.markets_analyzed == 5
+    
+    def test_run_on_monitored_users_batches_per_user(self):
+        """Test that each user's markets are analyzed with one batch call."""
+        decision_maker = MockDecisionMaker()
+        bot = self._make_bot(decision_maker)
+        user_markets = {"alice": self.markets[:3], "bob": self.markets[3:]}
+        
+        with patch.object(decision_maker, "analyze_markets", wraps=decision_maker.analyze_markets) as mock_batch, \
+             patch.object(ManifoldWriter, "get_me", return_value={"balance": 100.0}), \
+             patch.object(bot.reader, "get_all_markets", return_value=user_markets):
+            session = bot.run_on_monitored_users(["alice", "bob"], max_bets_per_user=None, max_total_bets=None)
+        
+        assert mock_batch.call_count == 2
+        assert [d.market_id for d in session.decisions] == ["m0", "m1", "m2", "m3", "m4"]
+        assert session.markets_analyzed == 5
+    
+    def test_run_on_monitored_users_stops_analyzing_at_caps(self):
+        """Test that markets past the per-user and total bet caps are never analyzed."""
+        decision_maker = MockDecisionMaker(decision="YES", outcome_type="BINARY")
+        bot = self._make_bot(decision_maker)
+        markets = [dict(market, creatorUsername="MikhailTal") for market in self.markets]
+        user_markets = {"alice": markets[:3], "bob": markets[3:]}
+        writer_mocks = {"get_me": MagicMock(return_value={"balance": 100.0}), "place_bet": MagicMock(return_value={})}
+        
+        with patch.object(decision_maker, "analyze_markets", wraps=decision_maker.analyze_markets) as mock_batch, \
+             patch.multiple(ManifoldWriter, **writer_mocks), \
+             patch.object(bot.reader, "get_all_markets", return_value=user_markets):
+            session = bot.run_on_monitored_users(
+                ["alice", "bob"], max_bets_per_user=1, max_total_bets=2, delay_between_bets=0
+            )
+        
+        assert [[m["id"] for m in call[0][0]] for call in mock_batch.call_args_list] == [["m0"], ["m3"]]
+        assert session.markets_analyzed == 2
+        assert session.bets_placed == 2
+    
+    def test_run_on_user_markets_fetches_balance_concurrently(self):
+        """Test that the market fetch overlaps the starting balance lookup."""
+        import threading
+        
+        bot = self._make_bot(MockDecisionMaker())
+        balance_requested = threading.Event()
+        
+        def get_me():
+            balance_requested.set()
+            return {"balance": 100.0}
+        
+        def get_all_markets(usernames, limit):
+            # Only returns markets if the balance request started while we were fetching
+            return self.markets if balance_requested.wait(timeout=5) else []
+        
+        with patch.object(ManifoldWriter, "get_me", side_effect=get_me) as mock_get_me, \
+             patch.object(bot.reader, "get_all_markets", side_effect=get_all_markets):
+            session = bot.run_on_user_markets("alice", limit=0, max_bets=1)
+        
+        assert session.markets_analyzed == 5
+        assert session.initial_balance == 100.0
+        assert mock_get_me.call_count == 2  # start and end of session
+
+
+class TestLLMDecisionMaker:
+    """Test cases for LLMDecisionMaker."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.markets = [
+            {"id": "low", "question": "Low?", "probability": 0.2, "outcomeType": "BINARY"},
+            {"id": "high", "question": "High?", "probability": 0.8, "outcomeType": "BINARY"},
+            {"id": "fair", "question": "Fair?", "probability": 0.5, "outcomeType": "BINARY"},
+        ]
+    
+    @pytest.fixture
+    def openai_client(self, monkeypatch):
+        """OpenAI client mock that answers every completion with an undervalued estimate."""
+        import openai
+        
+        mock_client = Mock(spec=openai.OpenAI)
+        mock_client.chat.completions.create.return_value = SimpleNamespace(choices=[SimpleNamespace(
+            message=SimpleNamespace(content="PROBABILITY: 40%\nCONFIDENCE: 80%\nREASONING: Undervalued")
+        )])
+        monkeypatch.setattr("openai.OpenAI", MagicMock(return_value=mock_client))
+        return mock_client
+    
+    @patch("manifoldbot.ai.analyze_market_with_gpt")
+    def test_analyze_market(self, mock_gpt):
+        """Test a single analysis turns the LLM estimate into a decision."""
+        mock_gpt.return_value = {"llm_probability": 0.4, "confidence": 0.8, "reasoning": "Undervalued"}
+        decision_maker = LLMDecisionMaker(openai_api_key="test_key")
+        
+        decision = decision_maker.analyze_market(self.markets[0])
+        
+        assert decision.decision == "YES"
+        assert decision.metadata["llm_probability"] == 0.4
+        assert decision.metadata["probability_difference"] == pytest.approx(0.2)
+        # Caching is opt-in, so by default requests keep the API's default temperature
+        assert mock_gpt.call_args[1]["cache"] is None
+        assert mock_gpt.call_args[1]["temperature"] is None
+    
+    @patch("manifoldbot.ai.analyze_market_with_gpt")
+    def test_prompt_probability_exact_by_default(self, mock_gpt):
+        """Test that the LLM sees the exact market price unless probability_bucket is set."""
+        mock_gpt.return_value = {"llm_probability": 0.4, "confidence": 0.8, "reasoning": "Undervalued"}
+        market = dict(self.markets[0], probability=0.22)
+        
+        LLMDecisionMaker(openai_api_key="test_key").analyze_market(market)
+        LLMDecisionMaker(openai_api_key="test_key", probability_bucket=0.05).analyze_market(market)
+        
+        shown = [call[1]["current_probability"] for call in mock_gpt.call_args_list]
+        assert shown == [0.22, pytest.approx(0.2)]
+    
+    @patch("manifoldbot.ai.analyze_market_with_gpt")
+    def test_analyze_market_memoized(self, mock_gpt):
+        """Test that decisions are memoized by market id and rounded probability, but errors are not."""
+        mock_gpt.side_effect = [
+            RuntimeError("boom"),
+            {"llm_probability": 0.4, "confidence": 0.8, "reasoning": "Undervalued"},
+            {"llm_probability": 0.4, "confidence": 0.8, "reasoning": "Moved"},
+        ]
+        decision_maker = LLMDecisionMaker(openai_api_key="test_key", cache=True)
+        market = self.markets[0]
+        
+        assert decision_maker.analyze_market(market).decision == "SKIP"
+        first = decision_maker.analyze_market(market)
+        again = decision_maker.analyze_market(dict(market, probability=0.2001))
+        moved = decision_maker.analyze_market(dict(market, probability=0.25))
+        
+        assert again is first
+        assert moved.reasoning == "Moved"
+        assert mock_gpt.call_count == 3
+    
+    @patch("manifoldbot.ai.analyze_market_with_gpt")
+    def test_screening_model_cascade(self, mock_gpt):
+        """Test that only markets the screening model sees an edge in are confirmed with the main model."""
+        estimates = {
+            ("gpt-4o-mini", "Low?"): 0.4, ("gpt-4o-mini", "Fair?"): 0.51,
+            ("gpt-4", "Low?"): 0.45,
+        }
+        mock_gpt.side_effect = lambda question, model, **kwargs: {
+            "llm_probability": estimates[(model, question)], "confidence": 0.8, "reasoning": model, "model_used": model
+        }
+        decision_maker = LLMDecisionMaker(openai_api_key="test_key", screening_model="gpt-4o-mini")
+        
+        low = decision_maker.analyze_market(self.markets[0])
+        fair = decision_maker.analyze_market(self.markets[2])
+        
+        assert [call[1]["model"] for call in mock_gpt.call_args_list] == ["gpt-4o-mini", "gpt-4", "gpt-4o-mini"]
+        assert (low.decision, low.metadata["model"], low.metadata["llm_probability"]) == ("YES", "gpt-4", 0.45)
+        assert low.metadata["screening"]["llm_probability"] == 0.4
+        assert (fair.decision, fair.metadata["model"]) == ("SKIP", "gpt-4o-mini")
+    
+    @patch("manifoldbot.ai.analyze_markets_with_gpt")
+    def test_analyze_markets_batched(self, mock_batch):
+        """Test that batch_size routes analyze_markets through one batched call, skipping memoized markets."""
+        mock_batch.side_effect = lambda markets, **kwargs: [
+            {"llm_probability": 0.5, "confidence": 0.9, "reasoning": m["question"]} for m in markets
+        ]
+        decision_maker = LLMDecisionMaker(openai_api_key="test_key", batch_size=5, cache=True)
+        
+        decisions = decision_maker.analyze_markets(self.markets)
+        again = decision_maker.analyze_markets(self.markets + [{"id": "new", "question": "New?", "probability": 0.5}])
+        
+        assert [d.decision for d in decisions] == ["YES", "NO", "SKIP"]
+        assert again[:3] == decisions
+        assert mock_batch.call_count == 2
+        assert mock_batch.call_args_list[0][1]["batch_size"] == 5
+        assert [m["question"] for m in mock_batch.call_args_list[1][0][0]] == ["New?"]
+    
+    @patch("manifoldbot.ai.analyze_markets_with_batch_api")
+    def test_analyze_markets_batch_api(self, mock_batch_api):
+        """Test that use_batch_api sends all markets as one Batch API job."""
+        mock_batch_api.side_effect = lambda markets, **kwargs: [
+            {"llm_probability": 0.5, "confidence": 0.9, "reasoning": m["question"]} for m in markets
+        ]
+        decision_maker = LLMDecisionMaker(openai_api_key="test_key", use_batch_api=True)
+        
+        decisions = decision_maker.analyze_markets(self.markets)
+        
+        assert [d.decision for d in decisions] == ["YES", "NO", "SKIP"]
+        mock_batch_api.assert_called_once()
+    
+    @patch("manifoldbot.ai.analyze_market_with_gpt")
+    def test_failed_analysis_not_memoized(self, mock_gpt):
+        """Test that an unsuccessful analysis result is retried on the next call."""
+        mock_gpt.side_effect = [
+            {"llm_probability": 0.5, "confidence": 0.0, "reasoning": "Error: timeout", "success": False},
+            {"llm_probability": 0.4, "confidence": 0.8, "reasoning": "Undervalued", "success": True},
+        ]
+        decision_maker = LLMDecisionMaker(openai_api_key="test_key")
+        
+        assert decision_maker.analyze_market(self.markets[0]).decision == "SKIP"
+        assert decision_maker.analyze_market(self.markets[0]).decision == "YES"
+    
+    @patch("manifoldbot.ai.analyze_market_with_gpt_async")
+    def test_analyze_markets_concurrent(self, mock_gpt_async):
+        """Test that analyze_markets preserves order and respects max_concurrent."""
+        import asyncio
+        
+        in_flight = {"now": 0, "peak": 0}
+        
+        async def fake_gpt(question, description, current_probability, **kwargs):
+            in_flight["now"] += 1
+            in_flight["peak"] = max(in_flight["peak"], in_flight["now"])
+            await asyncio.sleep(0.01)
+            in_flight["now"] -= 1
+            return {"llm_probability": 0.5, "confidence": 0.9, "reasoning": question}
+        
+        mock_gpt_async.side_effect = fake_gpt
+        decision_maker = LLMDecisionMaker(openai_api_key="test_key", max_concurrent=2)
+        
+        decisions = decision_maker.analyze_markets(self.markets)
+        
+        assert [d.market_id for d in decisions] == ["low", "high", "fair"]
+        assert [d.decision for d in decisions] == ["YES", "NO", "SKIP"]
+        assert in_flight["peak"] == 2
+    
+    @patch("manifoldbot.ai.analyze_market_with_gpt_async")
+    def test_analyze_markets_inside_event_loop(self, mock_gpt_async):
+        """Test that the sync analyze_markets also works while an event loop is running."""
+        import asyncio
+        
+        async def fake_gpt(question, description, current_probability, **kwargs):
+            return {"llm_probability": 0.5, "confidence": 0.9, "reasoning": question}
+        
+        async def caller(decision_maker):
+            return decision_maker.analyze_markets(self.markets)
+        
+        mock_gpt_async.side_effect = fake_gpt
+        decisions = asyncio.run(caller(LLMDecisionMaker(openai_api_key="test_key")))
+        
+        assert [d.decision for d in decisions] == ["YES", "NO", "SKIP"]
+    
+    def test_analyze_market_cached(self, openai_client):
+        """Test that an identical prompt is answered from the cache at temperature 0."""
+        decision_maker = LLMDecisionMaker(openai_api_key="test_key", cache=True)
+        
+        first = decision_maker.analyze_market(self.markets[0])
+        second = decision_maker.analyze_market(self.markets[0])
+        
+        assert first.decision == second.decision == "YES"
+        assert openai_client.chat.completions.create.call_count == 1
+        assert openai_client.chat.completions.create.call_args[1]["temperature"] == 0.0
+    
+    def test_analyze_market_semantic_cache(self, openai_client):
+        """Test that a near-duplicate question reuses the analysis with its own probability."""
+        openai_client.embeddings.create.return_value = SimpleNamespace(data=[SimpleNamespace(index=0, embedding=[1.0, 0.0])])
+        decision_maker = LLMDecisionMaker(
+            openai_api_key="test_key", cache=False, semantic_cache=SemanticCache()
+        )
+        reworded = {"id": "low2", "question": "Is it low?", "probability": 0.6, "outcomeType": "BINARY"}
+        
+        first = decision_maker.analyze_market(self.markets[0])
+        second = decision_maker.analyze_market(reworded)
+        
+        assert first.decision == "YES"
+        assert second.decision == "NO"
+        assert second.market_id == "low2"
+        assert openai_client.chat.completions.create.call_count == 1
+        assert openai_client.embeddings.create.call_count == 2
+    
+    def test_analyze_market_probability_bucket(self, openai_client):
+        """Test that small price drifts share a cached analysis but keep their exact probability."""
+        decision_maker = LLMDecisionMaker(openai_api_key="test_key", cache=True, probability_bucket=0.05)
+        drifted = {**self.markets[0], "probability": 0.21}
+        
+        first = decision_maker.analyze_market(self.markets[0])
+        second = decision_maker.analyze_market(drifted)
+        
+        prompt = openai_client.chat.completions.create.call_args[1]["messages"][1]["content"]
+        assert "Current market probability: 20.0%" in prompt
+        assert openai_client.chat.completions.create.call_count == 1
+        assert first.metadata["probability_difference"] == pytest.approx(0.2)
+        assert second.metadata["probability_difference"] == pytest.approx(0.19)
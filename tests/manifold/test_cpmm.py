@@ -0,0 +1,72 @@
+"""
+Tests for CPMM (Constant Product Market Maker) calculations.
+"""
+
+import pytest
+from manifoldbot.manifold.cpmm import (
+    calculate_cpmm_impact, calculate_cpmm_impacts, calculate_cpmm_kelly_bet, cpmm_pool_after_bet, cpmm_probability
+)
+
+
+class TestCPMM:
+    """Test cases for CPMM pool math."""
+    
+    def test_probability(self):
+        """Test the probability implied by a pool."""
+        assert cpmm_probability({"YES": 100, "NO": 100}, 0.5) == 0.5
+        assert cpmm_probability({"YES": 50, "NO": 200}, 0.5) == pytest.approx(0.8)
+        assert cpmm_probability({"YES": 100, "NO": 100}, 0.3) == pytest.approx(0.3)
+    
+    def test_pool_after_bet_keeps_invariant(self):
+        """Test that a bet preserves y^p * n^(1-p) and moves the price towards the outcome."""
+        pool, p = {"YES": 50.0, "NO": 200.0}, 0.3
+        k = pool["YES"] ** p * pool["NO"] ** (1 - p)
+        before = cpmm_probability(pool, p)
+        
+        for outcome in ("YES", "NO"):
+            yes, no = cpmm_pool_after_bet(pool, p, 10.0, outcome)
+            after = cpmm_probability({"YES": yes, "NO": no}, p)
+            
+            assert yes ** p * no ** (1 - p) == pytest.approx(k)
+            assert (after > before) == (outcome == "YES")
+    
+    def test_impact(self):
+        """Test impact against a hand-computed bet, and markets without a pool."""
+        market = {"pool": {"YES": 100, "NO": 100}, "p": 0.5}
+        
+        # 100 M$ of YES: pool becomes (50, 200), probability 0.5 -> 0.8
+        assert calculate_cpmm_impact(market, 100, "YES") == pytest.approx(0.3)
+        assert calculate_cpmm_impact(market, 100, "NO") == pytest.approx(0.3)
+        assert calculate_cpmm_impact(market, 0, "YES") == 0.0
+        assert calculate_cpmm_impact({"probability": 0.5}, 100, "YES") is None
+        assert calculate_cpmm_impact({"pool": {"YES": 1, "NO": 1}}, 100, "YES") is None
+    
+    def test_impacts_match_pool_update(self):
+        """Test that the batch closed form agrees with updating the pool bet by bet."""
+        market = {"pool": {"YES": 400.0, "NO": 100.0}, "p": 0.4}
+        bets = [0.0, 1.0, 25.0, 1000.0]
+        before = cpmm_probability(market["pool"], market["p"])
+        
+        for outcome in ("YES", "NO"):
+            expected = []
+            for bet in bets:
+                yes, no = cpmm_pool_after_bet(market["pool"], market["p"], bet, outcome)
+                expected.append(abs(cpmm_probability({"YES": yes, "NO": no}, market["p"]) - before))
+            
+            assert calculate_cpmm_impacts(market, bets, outcome) == pytest.approx(expected)
+        assert calculate_cpmm_impacts({}, bets, "YES") is None
+    
+    def test_kelly_bet(self):
+        """Test Kelly sizing against the pool: edge-limited, impact-limited, and without edge or pool."""
+        market = {"pool": {"YES": 400.0, "NO": 100.0}, "p": 0.5}  # 20%
+        
+        small = calculate_cpmm_kelly_bet(market, 0.25, "YES", 100.0, 0.25, 0.5, 0.0, 1000.0)
+        capped = calculate_cpmm_kelly_bet(market, 0.9, "YES", 10000.0, 1.0, 0.05, 0.0, 10000.0)
+        
+        # Edge-limited: close to the fractional Kelly bet at the pre-bet price
+        assert 0 < small <= 0.25 * 100.0 * (0.25 - 0.2) / 0.8
+        # Impact-limited: just under the bet that moves the price by 5%
+        assert calculate_cpmm_impact(market, capped, "YES") <= 0.05
+        assert calculate_cpmm_impact(market, capped + 0.1, "YES") > 0.05
+        assert calculate_cpmm_kelly_bet(market, 0.1, "YES", 100.0, 0.25, 0.05, 1.0, 100.0) == 1.0
+        assert calculate_cpmm_kelly_bet({}, 0.9, "YES", 100.0, 0.25, 0.05, 1.0, 100.0) is None
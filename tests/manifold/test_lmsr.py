@@ -4,7 +4,9 @@ Tests for LMSR (Logarithmic Market Scoring Rule) calculations.
 
 import pytest
 import math
-from manifoldbot.manifold.lmsr import LMSRCalculator, calculate_market_impact, find_max_bet_by_impact
+from manifoldbot.manifold.lmsr import (
+    LMSRCalculator, calculate_market_impact, find_max_bet_by_impact, get_calculator, kelly_bet_with_impact
+)
 
 
 class TestLMSRCalculator:
@@ -27,6 +29,32 @@ class TestLMSRCalculator:
         converted_back = self.calculator.log_odds_to_probability(log_odds)
         assert abs(converted_back - prob) < 1e-10
     
+    def test_marginal_and_impact(self):
+        """Test the combined call matches the separate marginal and impact calculations."""
+        for outcome in ["YES", "NO"]:
+            for bet_amount in [0.0, 10.0, 75.0]:
+                marginal, impact = self.calculator.calculate_marginal_and_impact(bet_amount, 0.3, outcome)
+                
+                assert marginal == pytest.approx(self.calculator.calculate_new_probability(bet_amount, 0.3, outcome))
+                assert impact == pytest.approx(abs(marginal - 0.3))
+                assert impact == self.calculator.calculate_market_impact(bet_amount, 0.3, outcome)
+    
+    def test_huge_bets_do_not_overflow(self):
+        """Test that bets far beyond the liquidity saturate instead of overflowing."""
+        calculator = LMSRCalculator(50.0)
+        
+        assert calculator.log_odds_to_probability(-1000.0) == 0.0
+        assert calculator.log_odds_to_probability(1000.0) == 1.0
+        assert calculator.calculate_new_probability(1e5, 0.5, "NO") == pytest.approx(0.0)
+        assert calculator.calculate_market_impact(1e5, 0.5, "NO") == pytest.approx(0.5)
+        assert calculator.calculate_market_impact(1e5, 0.5, "YES") == pytest.approx(0.5)
+    
+    def test_probability_to_log_odds_matches_natural_log(self):
+        """Test the base-2 log-odds agree with math.log to rounding error."""
+        for prob in [1e-9, 0.01, 0.3, 0.5, 0.77, 0.999999]:
+            expected = math.log(prob / (1 - prob))
+            assert self.calculator.probability_to_log_odds(prob) == pytest.approx(expected, rel=1e-14, abs=1e-15)
+    
     def test_log_odds_to_probability(self):
         """Test log-odds to probability conversion."""
         # Test edge cases
@@ -118,6 +146,22 @@ class TestLMSRCalculator:
         yes_impact = self.calculator.calculate_market_impact(bet_amount, current_prob, "YES")
         assert abs(yes_impact - (new_prob_yes - current_prob)) < 1e-10
     
+    def test_calculate_new_probabilities_matches_scalar(self):
+        """Test the batch closed form against calculate_new_probability."""
+        bets = [0.0, 1.0, 10.0, 50.0, 250.0]
+        
+        for prob in [0.05, 0.5, 0.93]:
+            for outcome in ["YES", "NO"]:
+                batch = self.calculator.calculate_new_probabilities(bets, prob, outcome)
+                impacts = self.calculator.calculate_market_impacts(bets, prob, outcome)
+                for bet, new_prob, impact in zip(bets, batch, impacts):
+                    assert new_prob == pytest.approx(self.calculator.calculate_new_probability(bet, prob, outcome))
+                    assert impact == pytest.approx(self.calculator.calculate_market_impact(bet, prob, outcome))
+        
+        # Huge bets saturate instead of overflowing
+        assert self.calculator.calculate_new_probabilities([1e6], 0.5, "YES") == [1.0]
+        assert self.calculator.calculate_new_probabilities([1e6], 0.5, "NO") == [0.0]
+    
     def test_find_max_bet_by_impact(self):
         """Test finding maximum bet by impact limit."""
         current_prob = 0.5
@@ -220,6 +264,31 @@ class TestConvenienceFunctions:
         assert actual_impact <= max_impact + 1e-10
 
 
+    def test_get_calculator_memoized(self):
+        """Test that calculators are shared per liquidity level."""
+        assert get_calculator(250.0) is get_calculator(250.0)
+        assert get_calculator(250.0) is not get_calculator(300.0)
+        assert get_calculator(250.0).b == 250.0
+    
+    def test_kelly_bet_with_impact_function(self):
+        """Test the Kelly bet respects the impact limit."""
+        calculator = LMSRCalculator(100.0)
+        
+        bet = kelly_bet_with_impact(
+            0.8, 0.5, bankroll=1000.0, liquidity=100.0,
+            kelly_fraction=0.25, max_prob_impact=0.05, min_bet=1.0, max_bet=1000.0
+        )
+        assert bet > 1.0
+        assert calculator.calculate_market_impact(bet, 0.5, "YES") <= 0.05 + 1e-10
+        
+        # Small bankroll: the Kelly size binds before the impact limit
+        bet = kelly_bet_with_impact(
+            0.6, 0.5, bankroll=20.0, liquidity=1000.0,
+            kelly_fraction=1.0, max_prob_impact=0.05, min_bet=0.0, max_bet=100.0
+        )
+        assert bet == pytest.approx(4.0, abs=0.1)
+
+
 class TestLMSRProperties:
     """Test mathematical properties of LMSR."""
     
@@ -316,3 +385,17 @@ class TestLMSRProperties:
         # Both should be between new and current probability
         new_prob = calculator.calculate_new_probability(bet_amount, current_prob, "NO")
         assert new_prob <= marginal_prob <= effective_prob <= current_prob
+    
+    def test_marginal_probability_signed_matches_string_api(self):
+        """Test that the signed marginal probability matches the YES/NO version."""
+        calculator = LMSRCalculator(100.0)
+        
+        for current_prob in [0.05, 0.5, 0.9]:
+            for bet_amount in [0.0, 5.0, 50.0, 500.0]:
+                for outcome, sign in [("YES", 1.0), ("NO", -1.0)]:
+                    expected = calculator.calculate_new_probability(bet_amount, current_prob, outcome)
+                    signed = calculator.calculate_marginal_probability_signed(bet_amount, current_prob, sign)
+                    assert abs(signed - expected) < 1e-12
+        
+        # Huge NO bets saturate instead of overflowing
+        assert calculator.calculate_marginal_probability_signed(1e6, 0.5, -1.0) < 1e-200
@@ -4,6 +4,7 @@ Tests for market impact calculations and limits.
 
 import pytest
 from manifoldbot.manifold.bot import KellyCriterionDecisionMaker, ConfidenceBasedDecisionMaker
+from manifoldbot.manifold.cpmm import calculate_cpmm_impact
 
 
 class TestMarketImpact:
@@ -33,6 +34,24 @@ class TestMarketImpact:
         )
         assert actual_impact <= 0.05 + 1e-10  # Allow small numerical error
     
+    def test_kelly_bets_batch(self):
+        """Test that the batch API matches per-market calls and broadcasts scalars."""
+        kelly_dm = KellyCriterionDecisionMaker(kelly_fraction=0.25, max_prob_impact=0.05, min_bet=1.0, max_bet=100.0)
+        true_probs = [0.8, 0.6, 0.3]
+        market_probs = [0.5, 0.4, 0.5]
+        subsidies = [100.0, None, 50.0]
+        
+        bets = kelly_dm.calculate_kelly_bets(true_probs, market_probs, 500.0, subsidies)
+        
+        assert bets == [
+            kelly_dm.calculate_kelly_bet(t, m, 500.0, s) for t, m, s in zip(true_probs, market_probs, subsidies)
+        ]
+        assert kelly_dm.calculate_kelly_bets(true_probs, market_probs, 500.0, 100.0) == [
+            kelly_dm.calculate_kelly_bet(t, m, 500.0, 100.0) for t, m in zip(true_probs, market_probs)
+        ]
+        with pytest.raises(ValueError):
+            kelly_dm.calculate_kelly_bets([0.8], [0.5, 0.4], 500.0)
+    
     def test_confidence_market_impact_limit(self):
         """Test that ConfidenceBasedDecisionMaker respects 5% market subsidy limit."""
         conf_dm = ConfidenceBasedDecisionMaker(base_bet=10.0, max_bet=1000.0)
@@ -128,3 +147,46 @@ class TestMarketImpact:
         assert decision.metadata is not None
         assert decision.metadata["market_subsidy"] == 0
         assert decision.metadata["max_bet_by_impact"] is None
+    
+    def test_cpmm_sizing_respects_impact_limit(self):
+        """Test that a pooled market's bet is sized so its reported CPMM impact stays within the limit."""
+        kelly_dm = KellyCriterionDecisionMaker(kelly_fraction=1.0, max_prob_impact=0.05, max_bet=1000.0)
+        # Shallow pools next to a large subsidy: LMSR sizing would move these markets far more than 5%
+        markets = {
+            "YES": {"id": "low", "probability": 0.2, "subsidy": 1000.0, "pool": {"YES": 40.0, "NO": 10.0}, "p": 0.5},
+            "NO": {"id": "high", "probability": 0.8, "subsidy": 1000.0, "pool": {"YES": 10.0, "NO": 40.0}, "p": 0.5},
+        }
+        
+        lmsr_bet = kelly_dm.calculate_kelly_bet(0.4, 0.2, 1000.0, 1000.0)
+        assert calculate_cpmm_impact(markets["YES"], lmsr_bet, "YES") > 0.05
+        
+        for outcome, market in markets.items():
+            decision = kelly_dm.analyze_market(market, bankroll=1000.0)
+            
+            assert decision.decision == outcome
+            assert decision.bet_amount > kelly_dm.min_bet
+            assert decision.metadata["market_impact"] <= 0.05 + 1e-9
+            assert decision.metadata["market_impact"] == pytest.approx(
+                calculate_cpmm_impact(market, decision.bet_amount, outcome)
+            )
+    
+    def test_analyze_market_uses_cpmm_pool(self):
+        """Test that reported impact comes from the market's CPMM pool when present."""
+        kelly_dm = KellyCriterionDecisionMaker()
+        market = {
+            "id": "test123",
+            "question": "Test question",
+            "probability": 0.2,
+            "subsidy": 200.0,
+            "pool": {"YES": 400.0, "NO": 100.0},
+            "p": 0.5
+        }
+        
+        decision = kelly_dm.analyze_market(market, bankroll=100.0)
+        
+        assert decision.metadata["market_impact"] == pytest.approx(
+            calculate_cpmm_impact(market, decision.bet_amount, "YES")
+        )
+        assert decision.metadata["market_impact"] != pytest.approx(
+            kelly_dm.calculate_market_impact(decision.bet_amount, 0.2, 200.0, "YES")
+        )
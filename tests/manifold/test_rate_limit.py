@@ -0,0 +1,56 @@
+"""
+Tests for the client-side rate limiter.
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from manifoldbot.manifold.rate_limit import TokenBucket
+
+
+class TestTokenBucket:
+    """Test cases for TokenBucket."""
+
+    def test_burst_then_throttle(self):
+        """Test that a full bucket allows a burst, then refuses."""
+        bucket = TokenBucket(rate=1.0, capacity=3)
+
+        assert all(bucket.try_acquire() for _ in range(3))
+        assert not bucket.try_acquire()
+
+    @patch("manifoldbot.manifold.rate_limit.time.monotonic")
+    def test_refill(self, mock_monotonic):
+        """Test that tokens accrue at the configured rate up to capacity."""
+        mock_monotonic.return_value = 100.0
+        bucket = TokenBucket(rate=2.0, capacity=4)
+        assert bucket.try_acquire(4)
+
+        mock_monotonic.return_value = 101.0
+        assert bucket.try_acquire(2)
+        assert not bucket.try_acquire()
+
+        mock_monotonic.return_value = 1000.0
+        assert bucket.try_acquire(4)
+        assert not bucket.try_acquire()
+
+    @patch("manifoldbot.manifold.rate_limit.time.sleep")
+    @patch("manifoldbot.manifold.rate_limit.time.monotonic")
+    def test_acquire_waits(self, mock_monotonic, mock_sleep):
+        """Test that acquire sleeps just long enough for the missing tokens."""
+        mock_monotonic.return_value = 0.0
+        bucket = TokenBucket(rate=4.0, capacity=1)
+        bucket.acquire()
+
+        mock_sleep.side_effect = lambda seconds: setattr(mock_monotonic, "return_value", seconds)
+        waited = bucket.acquire()
+
+        assert waited == pytest.approx(0.25)
+        mock_sleep.assert_called_once_with(pytest.approx(0.25))
+
+    def test_invalid_arguments(self):
+        """Test validation of rate, capacity and request size."""
+        with pytest.raises(ValueError):
+            TokenBucket(rate=0)
+        with pytest.raises(ValueError):
+            TokenBucket(capacity=2).acquire(3)
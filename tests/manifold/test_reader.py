@@ -9,7 +9,9 @@ from unittest.mock import Mock, patch
 import pytest
 import requests
 
-from manifoldbot.manifold.reader import ManifoldReader
+from manifoldbot.manifold.rate_limit import TokenBucket
+from manifoldbot.manifold.reader import ManifoldReader, create_session
+from manifoldbot.manifold.writer import ManifoldWriter
 
 
 class TestManifoldReader:
@@ -36,6 +38,24 @@ class TestManifoldReader:
 
         assert reader.retry_config == custom_config
 
+    def test_init_pooled_session(self):
+        """Test that the default session mounts a pooled adapter."""
+        reader = ManifoldReader()
+        adapter = reader.session.get_adapter(reader.BASE_URL)
+
+        assert adapter._pool_connections == 20
+        assert adapter._pool_maxsize == 40
+
+    def test_init_shared_session(self):
+        """Test that an injected session is reused rather than replaced."""
+        session = create_session()
+        reader = ManifoldReader(session=session)
+        writer = ManifoldWriter(api_key="test_key", session=session)
+
+        assert reader.session is session
+        assert writer.session is session
+        assert session.headers["User-Agent"] == "ManifoldBot/0.1.0"
+
     @patch("manifoldbot.manifold.reader.requests.Session.request")
     def test_make_request_success(self, mock_request):
         """Test successful API request."""
@@ -85,6 +105,42 @@ class TestManifoldReader:
         assert result == {"success": True}
         assert mock_request.call_count == 2
 
+    @patch("manifoldbot.manifold.reader.requests.Session.request")
+    def test_make_request_respects_retry_after(self, mock_request):
+        """Test that a Retry-After header longer than the backoff is honoured."""
+        mock_response_429 = Mock()
+        mock_response_429.status_code = 429
+        mock_response_429.headers = {"Retry-After": "7"}
+
+        mock_response_200 = Mock()
+        mock_response_200.status_code = 200
+        mock_response_200.json.return_value = {"success": True}
+
+        mock_request.side_effect = [mock_response_429, mock_response_200]
+
+        with patch("time.sleep") as mock_sleep:
+            self.reader._make_request("GET", "test")
+
+        mock_sleep.assert_called_once_with(7.0)
+
+    @patch("manifoldbot.manifold.reader.requests.Session.request")
+    def test_make_request_rate_limited(self, mock_request):
+        """Test that every attempt waits on the shared token bucket."""
+        bucket = Mock(spec=TokenBucket)
+        reader = ManifoldReader(rate_limit=bucket)
+
+        mock_response_500 = Mock()
+        mock_response_500.status_code = 500
+        mock_response_200 = Mock()
+        mock_response_200.status_code = 200
+        mock_response_200.json.return_value = {"success": True}
+        mock_request.side_effect = [mock_response_500, mock_response_200]
+
+        with patch("time.sleep"):
+            reader._make_request("GET", "test")
+
+        assert bucket.acquire.call_count == 2
+
     @patch("manifoldbot.manifold.reader.requests.Session.request")
     def test_make_request_max_retries_exceeded(self, mock_request):
         """Test behavior when max retries exceeded."""
@@ -144,6 +200,40 @@ class TestManifoldReader:
         second_call_args = mock_make_request.call_args_list[1]
         assert second_call_args[1]["params"]["cursor"] == "cursor123"
 
+    @patch("manifoldbot.manifold.reader.requests.Session.request")
+    def test_get_markets_if_changed_revalidates(self, mock_request):
+        """Test that repeated market polls send the ETag back and a 304 returns None."""
+        fresh = Mock(status_code=200, headers={"ETag": '"v1"'})
+        fresh.json.return_value = [{"id": "1"}]
+        not_modified = Mock(status_code=304, headers={})
+        mock_request.side_effect = [fresh, not_modified]
+
+        first = self.reader.get_markets_if_changed(limit=10)
+        second = self.reader.get_markets_if_changed(limit=10)
+
+        assert first == [{"id": "1"}]
+        assert second is None
+        assert mock_request.call_args_list[0][1]["headers"] is None
+        assert mock_request.call_args_list[1][1]["headers"] == {"If-None-Match": '"v1"'}
+
+    @patch("manifoldbot.manifold.reader.requests.Session.request")
+    def test_only_polling_is_conditional(self, mock_request):
+        """Test that plain GETs never send validators and a mutated poll result doesn't leak."""
+        fresh = Mock(status_code=200, headers={"ETag": '"v1"'})
+        fresh.json.side_effect = lambda: [{"id": "1", "probability": 0.5}]
+        not_modified = Mock(status_code=304, headers={})
+        mock_request.side_effect = [fresh, not_modified, fresh]
+
+        first = self.reader.get_markets_if_changed(limit=10)
+        first[0]["probability"] = 0.9
+        second = self.reader.get_markets_if_changed(limit=10)
+        plain = self.reader.get_markets(limit=10)
+
+        assert second is None
+        assert plain == [{"id": "1", "probability": 0.5}]
+        assert mock_request.call_args_list[2][1]["headers"] is None
+        assert list(self.reader._validated.values()) == [{"If-None-Match": '"v1"'}]
+
     @patch.object(ManifoldReader, "_make_request")
     def test_paginate_with_limit(self, mock_make_request):
         """Test pagination with limit."""
@@ -200,6 +290,45 @@ class TestManifoldReader:
         assert result == mock_markets
         mock_paginate.assert_called_once_with("markets", params=filters, limit=20)
 
+    @patch.object(ManifoldReader, "_make_request")
+    def test_get_all_markets_stops_at_limit(self, mock_make_request):
+        """Test that get_all_markets stops paging once the user has enough markets."""
+        first_page = [{"id": f"a{i}", "creatorUsername": "alice" if i % 2 else "bob"} for i in range(1000)]
+        second_page = [{"id": f"b{i}", "creatorUsername": "alice"} for i in range(1000)]
+        mock_make_request.side_effect = [first_page, second_page]
+
+        result = self.reader.get_all_markets("alice", limit=3)
+
+        assert [m["id"] for m in result] == ["a1", "a3", "a5"]
+        mock_make_request.assert_called_once()
+
+    @patch.object(ManifoldReader, "_make_request")
+    def test_get_all_markets_counts_like_filter(self, mock_make_request):
+        """Test that display-name matches don't stop paging once usernames match."""
+        first_page = [{"id": "a0", "creatorUsername": "alice"}] + [
+            {"id": f"a{i}", "creatorUsername": "other", "creatorName": "alice"} for i in range(1, 1000)
+        ]
+        second_page = [{"id": f"b{i}", "creatorUsername": "alice"} for i in range(2)]
+        mock_make_request.side_effect = [first_page, second_page]
+
+        result = self.reader.get_all_markets("alice", limit=3)
+
+        assert [m["id"] for m in result] == ["a0", "b0", "b1"]
+        assert mock_make_request.call_count == 2
+
+    @patch.object(ManifoldReader, "_make_request")
+    def test_get_all_markets_without_limit_pages(self, mock_make_request):
+        """Test that get_all_markets keeps paging without a limit."""
+        first_page = [{"id": f"a{i}", "creatorUsername": "alice"} for i in range(1000)]
+        second_page = [{"id": "b0", "creatorUsername": "alice"}]
+        mock_make_request.side_effect = [first_page, second_page]
+
+        result = self.reader.get_all_markets("alice")
+
+        assert len(result) == 1001
+        assert mock_make_request.call_count == 2
+        assert mock_make_request.call_args[1]["params"]["before"] == "a999"
+
     @patch.object(ManifoldReader, "_paginate")
     def test_get_trending_markets(self, mock_paginate):
         """Test get_trending_markets method."""
@@ -413,6 +542,7 @@ class TestManifoldReader:
         assert result == expected
 
 
+@pytest.mark.integration
 class TestManifoldReaderReal:
     """Real API tests for ManifoldReader."""
 
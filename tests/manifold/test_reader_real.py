@@ -9,6 +9,8 @@ import pytest
 
 from manifoldbot.manifold.reader import ManifoldReader
 
+pytestmark = pytest.mark.integration
+
 
 class TestManifoldReaderReal:
     """Real API tests for ManifoldReader."""
@@ -11,18 +11,20 @@ import requests
 from manifoldbot.manifold.writer import ManifoldWriter
 
 
+pytestmark = pytest.mark.integration
+
+
+@pytest.fixture(scope="class")
+def writer(request):
+    """One authenticated writer (and connection pool) shared by the whole class."""
+    request.cls.writer = ManifoldWriter(api_key=os.getenv("MANIFOLD_API_KEY"))
+
+
 @pytest.mark.skipif(not os.getenv("MANIFOLD_API_KEY"), reason="MANIFOLD_API_KEY not set")
+@pytest.mark.usefixtures("writer")
 class TestManifoldWriterReal:
     """Real API tests for ManifoldWriter."""
 
-    def setup_method(self):
-        """Set up test fixtures."""
-        api_key = os.getenv("MANIFOLD_API_KEY")
-        if not api_key:
-            pytest.skip("MANIFOLD_API_KEY not set")
-        
-        self.writer = ManifoldWriter(api_key=api_key)
-
     def test_authentication(self):
         """Test that authentication works."""
         assert self.writer.is_authenticated()
@@ -2,56 +2,16 @@
 Tests for example scripts to ensure they are functional.
 """
 
-import os
 import pytest
-from unittest.mock import patch, MagicMock
 
-# Test the LLM trading bot
-def test_llm_trading_bot_import():
-    """Test that the LLM trading bot can be imported."""
-    from manifoldbot.examples.bot.llm_trading_bot import main
-    
-    # Test that main function exists
-    assert callable(main)
 
-def test_llm_trading_bot_init():
-    """Test LLM trading bot can be imported and has main function."""
-    from manifoldbot.examples.bot.llm_trading_bot import main
-    
-    # Test that main function exists and is callable
-    assert callable(main)
-
-def test_llm_trading_bot_analyze_market():
-    """Test that LLM trading bot imports work."""
-    from manifoldbot.examples.bot.llm_trading_bot import main
-    
-    # Test that main function exists
-    assert callable(main)
-
-def test_llm_trading_bot_run_on_user_markets():
-    """Test that LLM trading bot can be imported."""
-    from manifoldbot.examples.bot.llm_trading_bot import main
-    
-    # Test that main function exists
-    assert callable(main)
-
-def test_basic_reader_example():
-    """Test that basic reader example can be imported."""
-    from manifoldbot.examples.manifold.basic_reader import main
-    
-    # Test that main function exists
-    assert callable(main)
-
-def test_basic_writer_example():
-    """Test that basic writer example can be imported."""
-    from manifoldbot.examples.manifold.basic_writer import main
-    
-    # Test that main function exists
-    assert callable(main)
-
-def test_ai_optimist_trading_bot_example():
-    """Test that AI optimist trading bot example can be imported."""
-    from manifoldbot.examples.bot.ai_optimist_trading_bot import main
-    
-    # Test that main function exists
-    assert callable(main)
\ No newline at end of file
+@pytest.mark.parametrize("name", [
+    "llm_trading_bot",
+    "ai_optimist_trading_bot",
+    "basic_reader",
+    "basic_writer",
+    "bet_sizing_example",
+])
+def test_example_imports(example_modules, name):
+    """Test that each example can be imported and has a main function."""
+    assert callable(example_modules[name].main)